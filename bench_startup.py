@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for DUSK CIPHER entry points
+Runs each entry point script the way a user would under
+``python -X importtime`` and fails when the time spent importing modules,
+argument parsing included, exceeds its startup budget. The CLIs run with
+``--help``; the loader runs a tiny module from a payload store, its hot
+path.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import base64
+import shutil
+import tempfile
+import subprocess
+import statistics
+
+# Budget per entry point in milliseconds (warm cache). The CLIs parse their
+# arguments with argparse, which with its dependencies takes ~15 ms; their
+# budgets are the module import budgets plus that. The loader parses its
+# command line by hand and keeps its import-only budget.
+BUDGETS_MS = {
+    'dusk_cipher': 40,
+    'pyobfuscator': 45,
+    'pydecoder': 45,
+    'dusk_loader': 10,
+    'web_obfuscator': 135,
+}
+
+# Command line per entry point ({store} is a payload store with one module)
+COMMANDS = {
+    'dusk_loader': ['-p', '{store}', 'dusk_bench_app'],
+}
+DEFAULT_COMMAND = ['--help']
+
+
+def top_level_imports(args: list[str], cwd: str, env: dict) -> dict[str, float]:
+    """Run a command under -X importtime; cumulative ms per top-level import."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <name>", where
+        # nested imports are indented by two spaces per level
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith('  '):
+            imports[parts[2].strip()] = int(parts[1]) / 1000.0
+    return imports
+
+
+def measure_startup_ms(script: str, args: list[str], cwd: str, env: dict,
+                       interpreter: set[str]) -> float:
+    """Return the import time of running ``script args`` in milliseconds.
+
+    Modules the interpreter itself imports before the script starts
+    (``interpreter``) are left out.
+    """
+    imports = top_level_imports([f'{script}.py', *args], cwd, env)
+    if not imports:
+        raise RuntimeError(f"No importtime entries for {script}")
+    return sum(ms for name, ms in imports.items() if name not in interpreter)
+
+
+def main():
+    """Main function to run the startup benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark startup time of DUSK CIPHER entry points')
+    parser.add_argument('-n', '--runs', type=int, default=7, help='Runs per entry point (default: 7)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply all budgets, e.g. 2.0 on slow machines')
+    parser.add_argument('modules', nargs='*', help='Entry points to measure (default: all)')
+    args = parser.parse_args()
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    modules = args.modules or list(BUDGETS_MS)
+
+    # Measure with bytecode caching enabled, as installed tools would run
+    pycache_dir = tempfile.mkdtemp(prefix='dusk_bench_')
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPYCACHEPREFIX'] = pycache_dir
+
+    # The loader's payload store: one module that does nothing
+    store = os.path.join(pycache_dir, 'store')
+    os.mkdir(store)
+    with open(os.path.join(store, 'dusk_bench_app.dusk'), 'wb') as f:
+        f.write(base64.b64encode(b'pass\n'))
+
+    failures = 0
+    try:
+        interpreter = set(top_level_imports(['-c', 'pass'], repo_dir, env))
+        for module in modules:
+            budget = BUDGETS_MS[module] * args.scale
+            command = [arg.format(store=store) for arg in COMMANDS.get(module, DEFAULT_COMMAND)]
+            measure_startup_ms(module, command, repo_dir, env, interpreter)  # warm-up, writes bytecode
+            samples = [measure_startup_ms(module, command, repo_dir, env, interpreter)
+                       for _ in range(args.runs)]
+            median = statistics.median(samples)
+            ok = median <= budget
+            if not ok:
+                failures += 1
+            status = '✓' if ok else '✗'
+            print(f"{status} {module:<16} median {median:7.2f} ms  "
+                  f"(min {min(samples):.2f}, budget {budget:.0f} ms)")
+    finally:
+        shutil.rmtree(pycache_dir, ignore_errors=True)
+
+    if failures:
+        print(f"\n{failures} entry point(s) over startup budget", file=sys.stderr)
+        return 1
+    print(f"\nAll {len(modules)} entry point(s) within startup budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Access Log
+Structured JSON-lines access log for the web server. Request threads only
+put a record on a bounded queue; a background thread serializes records in
+batches and writes each batch with a single write call, so logging never
+blocks a request on disk or terminal I/O.
+
+When the queue is full, records are dropped and counted instead of growing
+memory, and the writer reports the count. Sampling keeps a fraction of
+successful requests on busy deployments; errors (status >= 400) are always
+kept.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import queue
+import random
+import threading
+
+MAX_PENDING = 10000
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 1.0
+
+
+class AccessLog:
+    """Background writer for JSON access log records."""
+
+    def __init__(self, path: str = '-', sample: float = 1.0, max_pending: int = MAX_PENDING,
+                 batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        if not 0.0 <= sample <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1: {sample}")
+        self.sample = sample
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.queue = queue.Queue(max_pending)
+
+        if path == '-':
+            self.fd = sys.stderr.fileno()
+            self.owns_fd = False
+        else:
+            # O_APPEND keeps whole batches from several processes intact
+            self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            self.owns_fd = True
+
+        self.thread = threading.Thread(target=self._run, name='access-log', daemon=True)
+        self.thread.start()
+
+    def log(self, record: dict) -> None:
+        """Queue a record; never blocks."""
+        if self.sample < 1.0 and (record.get('status') or 0) < 400 and random.random() >= self.sample:
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            done = None in batch
+            lines = [json.dumps(record, separators=(',', ':')) for record in batch if record is not None]
+            if self.dropped:
+                # Unsynchronized counter: a drop racing this reset may go unreported
+                dropped, self.dropped = self.dropped, 0
+                lines.append(json.dumps({'event': 'access_log_dropped', 'count': dropped}))
+            if lines:
+                self._write(('\n'.join(lines) + '\n').encode('utf-8'))
+            if done:
+                return
+
+    def _write(self, data: bytes) -> None:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self.fd, view):]
+        except OSError:
+            pass  # A broken log destination must not take the server down
+
+    def close(self) -> None:
+        """Write out everything queued and stop the writer thread."""
+        if not self.thread.is_alive():
+            return
+        self.queue.put(None)
+        self.thread.join()
+        if self.owns_fd:
+            os.close(self.fd)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Admission Control
+Per-route concurrency limits with a bounded wait queue for the web server.
+A request either gets a slot, waits for one, or is shed with a retry hint:
+immediately when the queue is full or its expected wait already exceeds the
+queue-time SLO, otherwise once it has waited the full SLO. Admitted requests
+then run with a fixed amount of concurrency, so their latency stays flat
+while excess load is turned away early and cheaply.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+
+# Weight of the newest sample in the service time average
+EWMA_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """A request was shed; ``retry_after`` is a whole number of seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class RouteLimiter:
+    """Concurrency limit for one route, with queue-time based shedding."""
+
+    def __init__(self, limit: int, max_queue: int, max_wait: float):
+        if limit < 1:
+            raise ValueError(f"Concurrency limit must be at least 1: {limit}")
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self.shed = 0
+        self.service_time = 0.0
+        self.cond = threading.Condition()
+
+    def expected_wait(self) -> float:
+        """Estimated queue time of a request arriving now."""
+        if self.active < self.limit:
+            return 0.0
+        return self.service_time * (self.waiting + 1) / self.limit
+
+    def acquire(self) -> float:
+        """Take a slot, returns seconds spent queued. Raises Overloaded."""
+        with self.cond:
+            if self.active < self.limit and not self.waiting:
+                self.active += 1
+                return 0.0
+
+            expected = self.expected_wait()
+            if self.waiting >= self.max_queue or expected > self.max_wait:
+                self.shed += 1
+                raise Overloaded('queue full' if self.waiting >= self.max_queue else 'queue wait over SLO',
+                                 self.retry_after(expected))
+
+            start = time.monotonic()
+            deadline = start + self.max_wait
+            self.waiting += 1
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        raise Overloaded('queue wait over SLO', self.retry_after(self.expected_wait()))
+                    self.cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            return time.monotonic() - start
+
+    def release(self, elapsed: float | None = None) -> None:
+        """Free a slot; ``elapsed`` (seconds in the handler) feeds the wait estimate."""
+        with self.cond:
+            self.active -= 1
+            if elapsed is not None:
+                if self.service_time:
+                    self.service_time += EWMA_ALPHA * (elapsed - self.service_time)
+                else:
+                    self.service_time = elapsed
+            self.cond.notify()
+
+    def retry_after(self, expected: float) -> int:
+        return max(1, math.ceil(expected or self.max_wait))
+
+    def stats(self) -> dict:
+        with self.cond:
+            return {'limit': self.limit, 'active': self.active, 'waiting': self.waiting,
+                    'shed': self.shed, 'service_time': round(self.service_time, 4)}
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER File Analyzer
+Directory-wide analysis of Python files with AST metrics, run in parallel
+and cached by (path, mtime, size) so repeated scans are near-instant.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import ast
+
+from dusk_classifier import WRAPPER, classify_header
+
+# Result caches live under $XDG_CACHE_HOME (default ~/.cache), one file per
+# analyzed directory, so scans never write into the tree they analyze
+CACHE_DIR = os.path.join('dusk-cipher', 'analyzer')
+CACHE_VERSION = 3
+
+# Below this many uncached files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+# Calls that identify the payload codec of an obfuscated wrapper, matched
+# as "module.function" or as a bare name imported with "from ... import"
+CODEC_CALLS = {
+    'b64decode': 'base64',
+    'b32decode': 'base32',
+    'b16decode': 'base16',
+    'a85decode': 'ascii85',
+    'b85decode': 'base85',
+    'zlib.decompress': 'zlib',
+    'bz2.decompress': 'bz2',
+    'lzma.decompress': 'lzma',
+    'marshal.loads': 'marshal',
+}
+
+
+class FileAnalyzer:
+    """Compute per-file and aggregate metrics for Python source trees."""
+
+    def __init__(self, use_cache: bool = True, workers: int | None = None):
+        self.supported_extensions = ['.py', '.pyw']
+        self.use_cache = use_cache
+        self.workers = workers
+
+    def analyze_file(self, path: str) -> dict:
+        """Analyze a single file and return its metrics."""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        result = {
+            'path': path,
+            'size': len(data),
+            'lines': data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0),
+            'nodes': 0,
+            'functions': 0,
+            'classes': 0,
+            'encrypted': False,
+            'codec': None,
+            'error': None,
+        }
+
+        try:
+            tree = ast.parse(data, filename=path)
+        except (SyntaxError, ValueError) as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            return result
+
+        for node in ast.walk(tree):
+            result['nodes'] += 1
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                result['functions'] += 1
+            elif isinstance(node, ast.ClassDef):
+                result['classes'] += 1
+
+        # The classifier decides wrapper vs plain; the AST only names the codec
+        kind, fmt = classify_header(data, len(data))
+        if kind == WRAPPER:
+            result['encrypted'] = True
+            result['codec'] = self.payload_codec(tree) or fmt.split(':')[0]
+
+        return result
+
+    def payload_codec(self, tree: ast.Module) -> str | None:
+        """Name the codecs between a wrapper's payload and its exec/eval.
+
+        Follows the module-level exec/eval call back to the payload it is
+        fed: a string assigned at module level (or decoded there, like a
+        sidecar stub), an inline literal, or the first parameter of a
+        module-level helper function. Returns e.g. ``base64+zlib`` (in
+        decode order) or None when no payload reaches an exec/eval.
+        """
+        payloads = {}
+        helpers = {}
+        for node in self._module_statements(tree.body):
+            if isinstance(node, ast.FunctionDef):
+                helpers[node.name] = node
+            elif isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                    and isinstance(node.targets[0], ast.Name):
+                value = node.value
+                if isinstance(value, ast.Constant) and isinstance(value.value, (str, bytes)):
+                    payloads[node.targets[0].id] = []
+                elif isinstance(value, ast.Call):
+                    codecs = [codec for codec in map(self._codec, ast.walk(value)) if codec]
+                    payloads[node.targets[0].id] = codecs[::-1]
+
+        for node in self._module_statements(tree.body):
+            if isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) \
+                    and getattr(node.value.func, 'id', None) in ('exec', 'eval'):
+                chain = self._decode_chain(node.value, payloads, helpers)
+                if chain:
+                    return '+'.join(chain)
+        return None
+
+    def _module_statements(self, body: list):
+        """Statements run at import time, without descending into defs."""
+        for node in body:
+            yield node
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                for field in ('body', 'orelse', 'finalbody'):
+                    yield from self._module_statements(getattr(node, field, []))
+
+    def _decode_chain(self, node: ast.AST, payloads: dict, helpers: dict) -> list[str] | None:
+        """Codecs applied to a payload within an expression, in decode order.
+
+        Calls are followed through their first argument only, the one
+        exec, compile and the decode functions take their data in.
+        """
+        if isinstance(node, ast.Name):
+            return payloads.get(node.id)
+        if isinstance(node, ast.Constant):
+            return [] if isinstance(node.value, (str, bytes)) else None
+        if not isinstance(node, ast.Call) or not node.args:
+            return None
+
+        chain = self._decode_chain(node.args[0], payloads, helpers)
+        if chain is None:
+            return None
+        codec = self._codec(node)
+        if codec:
+            return chain + [codec]
+        helper = helpers.get(getattr(node.func, 'id', None))
+        if helper and helper.args.args:
+            # The helper decodes its first parameter somewhere in its body
+            param = {helper.args.args[0].arg: chain}
+            for call in ast.walk(helper):
+                if isinstance(call, ast.Call):
+                    inner = self._decode_chain(call, param, {})
+                    if inner:
+                        return inner
+        return chain
+
+    def _codec(self, node: ast.AST) -> str | None:
+        """Codec of a decode call, or None for any other node."""
+        if not isinstance(node, ast.Call):
+            return None
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            name = func.attr
+            dotted = f"{getattr(func.value, 'id', '')}.{name}"
+        else:
+            name = dotted = getattr(func, 'id', None)
+        return CODEC_CALLS.get(dotted) or CODEC_CALLS.get(name)
+
+    def find_python_files(self, directory: str, recursive: bool = True) -> list[str]:
+        """Find Python files in a directory."""
+        if not os.path.isdir(directory):
+            raise ValueError(f"Path is not a directory: {directory}")
+
+        python_files = []
+        if recursive:
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
+                for name in files:
+                    if name.lower().endswith(tuple(self.supported_extensions)):
+                        python_files.append(os.path.join(root, name))
+        else:
+            for entry in os.scandir(directory):
+                if entry.is_file() and entry.name.lower().endswith(tuple(self.supported_extensions)):
+                    python_files.append(entry.path)
+
+        return sorted(python_files)
+
+    def analyze_directory(self, directory: str, recursive: bool = True) -> tuple[list[dict], dict]:
+        """Analyze all Python files under a directory.
+
+        Returns (per-file results, aggregate metrics).
+        """
+        files = self.find_python_files(directory, recursive)
+        cache_path = self.cache_path(directory)
+        cache = self.load_cache(cache_path) if self.use_cache else {}
+
+        results = {}
+        pending = []
+        keys = {}
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            keys[path] = [st.st_mtime_ns, st.st_size]
+            entry = cache.get(os.path.abspath(path))
+            if entry and entry['key'] == keys[path]:
+                results[path] = entry['result']
+            else:
+                pending.append(path)
+
+        for path, result in zip(pending, self._run(pending)):
+            results[path] = result
+
+        ordered = [results[path] for path in files if path in results]
+
+        if self.use_cache and pending:
+            new_cache = {os.path.abspath(path): {'key': keys[path], 'result': results[path]}
+                         for path in keys}
+            self.save_cache(cache_path, new_cache)
+
+        return ordered, self.aggregate(ordered)
+
+    def _run(self, paths: list[str]) -> list[dict]:
+        """Analyze paths, in a process pool when the batch is large enough."""
+        workers = self.workers or os.cpu_count() or 1
+        if len(paths) < PARALLEL_THRESHOLD or workers == 1:
+            return [self._safe_analyze(path) for path in paths]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._safe_analyze, paths, chunksize=chunksize))
+
+    def _safe_analyze(self, path: str) -> dict:
+        try:
+            return self.analyze_file(path)
+        except OSError as e:
+            return {'path': path, 'size': 0, 'lines': 0, 'nodes': 0, 'functions': 0,
+                    'classes': 0, 'encrypted': False, 'codec': None, 'error': str(e)}
+
+    def aggregate(self, results: list[dict]) -> dict:
+        """Sum per-file metrics into totals."""
+        totals = {'files': len(results), 'size': 0, 'lines': 0, 'nodes': 0,
+                  'functions': 0, 'classes': 0, 'encrypted': 0, 'plain': 0, 'errors': 0}
+        for result in results:
+            for key in ('size', 'lines', 'nodes', 'functions', 'classes'):
+                totals[key] += result[key]
+            if result['error']:
+                totals['errors'] += 1
+            elif result['encrypted']:
+                totals['encrypted'] += 1
+            else:
+                totals['plain'] += 1
+        return totals
+
+    def cache_path(self, directory: str) -> str:
+        """Cache file for a directory, keyed by its absolute path."""
+        import hashlib
+
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        digest = hashlib.sha256(os.path.abspath(directory).encode('utf-8', 'surrogateescape'))
+        return os.path.join(base, CACHE_DIR, digest.hexdigest()[:32] + '.json')
+
+    def load_cache(self, cache_path: str) -> dict:
+        """Load cached results, ignoring missing or incompatible caches."""
+        import json
+
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('entries', {})
+
+    def save_cache(self, cache_path: str, entries: dict) -> None:
+        """Write the cache atomically; failures only cost a rescan."""
+        import json
+
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': entries}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def format_table(self, results: list[dict], totals: dict) -> str:
+        """Render results as a plain-text table."""
+        lines = [f"{'File':<40} {'Size':>9} {'Lines':>7} {'Nodes':>8} {'Func':>5} {'Class':>5}  Status"]
+        lines.append('-' * len(lines[0]))
+        for r in results:
+            if r['error']:
+                status = 'error'
+            elif r['encrypted']:
+                status = f"encrypted ({r['codec']})"
+            else:
+                status = 'plain'
+            path = r['path'] if len(r['path']) <= 40 else '...' + r['path'][-37:]
+            lines.append(f"{path:<40} {r['size']:>9} {r['lines']:>7} {r['nodes']:>8} "
+                         f"{r['functions']:>5} {r['classes']:>5}  {status}")
+        lines.append('-' * len(lines[0]))
+        lines.append(f"{'TOTAL (' + str(totals['files']) + ' files)':<40} {totals['size']:>9} "
+                     f"{totals['lines']:>7} {totals['nodes']:>8} {totals['functions']:>5} "
+                     f"{totals['classes']:>5}  {totals['encrypted']} encrypted, "
+                     f"{totals['plain']} plain, {totals['errors']} errors")
+        return '\n'.join(lines)
+
+
+def main():
+    """Main function to handle command line arguments and run the analyzer."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='DUSK CIPHER File Analyzer - AST metrics for Python source trees')
+    parser.add_argument('directory', help='Directory to analyze')
+    parser.add_argument('-n', '--no-recursive', action='store_true',
+                        help='Only analyze the top-level directory')
+    parser.add_argument('-j', '--jobs', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the result cache')
+
+    args = parser.parse_args()
+    analyzer = FileAnalyzer(use_cache=not args.no_cache, workers=args.jobs)
+
+    try:
+        results, totals = analyzer.analyze_directory(args.directory, not args.no_recursive)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        import json
+        print(json.dumps({'files': results, 'totals': totals}, indent=2))
+    else:
+        print(analyzer.format_table(results, totals))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,14 +6,11 @@ Advanced Script Protection & Obfuscation System
 
 import os
 import sys
-import base64
-import argparse
-import pathlib
-import re
 import time
-import json
-from typing import List, Optional
-from datetime import datetime
+import base64
+
+from dusk_output import AtomicWriter, SYNC_POLICIES
+from dusk_stats import UsageStats
 
 
 class Colors:
@@ -36,6 +33,85 @@ class Colors:
     BG_YELLOW = '\033[103m'
 
 
+class ProgressBar:
+    """Byte-based progress bar with rolling throughput and ETA"""
+
+    def __init__(self, total_bytes, width=30, window=3.0, interval=0.1):
+        self.total_bytes = max(total_bytes, 1)
+        self.width = width
+        self.window = window
+        self.interval = interval
+        self.done_bytes = 0
+        self.started = time.perf_counter()
+        self.samples = [(self.started, 0)]
+        self.last_render = 0.0
+        self.interactive = sys.stdout.isatty()
+
+    def trim(self, now):
+        """Drop samples older than the window, keeping one before it"""
+        while len(self.samples) > 2 and now - self.samples[1][0] > self.window:
+            self.samples.pop(0)
+
+    def rate(self):
+        """Rolling throughput in bytes/second over the last window"""
+        now = time.perf_counter()
+        self.trim(now)
+        first_time, first_bytes = self.samples[0]
+        elapsed = now - first_time
+        return (self.done_bytes - first_bytes) / elapsed if elapsed > 0 else 0.0
+
+    def update(self, nbytes, label=''):
+        """Advance by nbytes and redraw (throttled)"""
+        self.done_bytes += nbytes
+        now = time.perf_counter()
+        self.samples.append((now, self.done_bytes))
+        # Also without a terminal, where render() never asks for the rate
+        self.trim(now)
+        if now - self.last_render >= self.interval or self.done_bytes >= self.total_bytes:
+            self.last_render = now
+            self.render(label)
+
+    def render(self, label=''):
+        """Draw the bar on the current terminal line"""
+        if not self.interactive:
+            return
+        fraction = min(self.done_bytes / self.total_bytes, 1.0)
+        filled = int(self.width * fraction)
+        rate = self.rate()
+        remaining = self.total_bytes - self.done_bytes
+        eta = f"{remaining / rate:5.1f}s" if rate > 0 and remaining > 0 else '  -  '
+        bar = '█' * filled + '░' * (self.width - filled)
+        sys.stdout.write(
+            f"\r{Colors.GRAY}   {bar} {fraction * 100:5.1f}% "
+            f"{format_size(self.done_bytes)}/{format_size(self.total_bytes)} "
+            f"{format_size(rate)}/s ETA {eta} {Colors.CYAN}{label[-24:]:<24}{Colors.END}"
+        )
+        sys.stdout.flush()
+
+    def clear_line(self):
+        """Erase the bar so a regular message can be printed"""
+        if self.interactive:
+            sys.stdout.write('\r\033[K')
+
+    def finish(self):
+        """Draw the final state and move to a new line"""
+        elapsed = time.perf_counter() - self.started
+        if self.interactive:
+            self.render()
+            sys.stdout.write('\n')
+        else:
+            print(f"   {format_size(self.done_bytes)} in {elapsed:.2f}s")
+        return elapsed
+
+
+def format_size(size):
+    """Format a byte count for display"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
 class DuskCipher:
     """Main class for the DUSK CIPHER encryption toolkit"""
 
@@ -44,36 +120,38 @@ class DuskCipher:
         self.author = "DuskCipher"
         self.community = "DuskCipher"
         self.platform = "Linux x86_64"
-        self.total_runs = self.get_total_runs()
+        self._total_runs = None
         self.status = "Active & Secure"
         self.supported_extensions = ['.py', '.pyw']
         self.obfuscated_suffix = '_encrypted'
         self.decoded_suffix = '_decrypted'
+        self.stats = UsageStats()
+        self.writer = AtomicWriter()
+
+    @property
+    def total_runs(self):
+        """Total runs, read from the stats store on first use"""
+        if self._total_runs is None:
+            self._total_runs = self.get_total_runs()
+        return self._total_runs
 
     def get_total_runs(self):
-        """Get total runs from stats file"""
-        stats_file = ".dusk_stats.json"
-        try:
-            if os.path.exists(stats_file):
-                with open(stats_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('total_runs', 0)
-        except:
-            pass
-        return 0
+        """Get total runs from stats store"""
+        return self.stats.summary()['total_runs']
 
     def update_stats(self):
-        """Update statistics"""
-        stats_file = ".dusk_stats.json"
-        try:
-            data = {
-                'total_runs': self.total_runs + 1,
-                'last_run': datetime.now().isoformat()
-            }
-            with open(stats_file, 'w') as f:
-                json.dump(data, f)
-        except:
-            pass
+        """Record one interactive session start"""
+        self.stats.record('run')
+        if self._total_runs is not None:
+            self._total_runs += 1
+
+    def clear_screen(self):
+        """Clear the terminal without spawning a shell"""
+        if os.name == 'posix':
+            sys.stdout.write('\033[2J\033[H')
+            sys.stdout.flush()
+        else:
+            os.system('cls')
 
     def print_banner(self):
         """Display the professional banner"""
@@ -176,6 +254,7 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
 
     def decrypt_script(self, encrypted_code: str) -> str:
         """Decrypt an encrypted Python script back to original"""
+        import re
         base64_content = None
 
         # Pattern matching for various variable names
@@ -250,6 +329,10 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
                 )
                 return
 
+            # One read and one encode: there is no progress to report until
+            # it is done, so single files get a timing line instead of a bar
+            started = time.perf_counter()
+            size = os.path.getsize(filename)
             with open(filename, 'r', encoding='utf-8') as f:
                 content = f.read()
 
@@ -260,16 +343,16 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
             encoded_content = self.encrypt_script(content)
             encrypted_script = self.create_encrypted_script(encoded_content)
 
-            print(f"{Colors.GRAY}   {'█' * 40} 100%{Colors.END}")
+            print(f"{Colors.GRAY}   {format_size(size)} in "
+                  f"{time.perf_counter() - started:.2f}s{Colors.END}")
 
+            import pathlib
             base_name = pathlib.Path(filename).stem
             output_file = f"{base_name}{self.obfuscated_suffix}.py"
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(encrypted_script)
+            self.writer.write(output_file, encrypted_script, mode=0o755)
 
-            if os.name == 'posix':
-                os.chmod(output_file, 0o755)
+            self.stats.record('encrypt', size, 1, time.perf_counter() - started)
 
             print(f"\n{Colors.GREEN}✅ Enkripsi berhasil!{Colors.END}")
             print(f"{Colors.MAGENTA}┌{'─' * 50}┐{Colors.END}")
@@ -296,11 +379,19 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         )
         print(f"{Colors.MAGENTA}{'╚' + '═' * 48 + '╝'}{Colors.END}")
 
-        # Show encrypted files
-        encrypted_files = [
-            f for f in os.listdir('.')
-            if '_encrypted' in f and f.endswith('.py')
-        ]
+        # Show encrypted files, classified from their header only
+        # (sidecar stubs are left to pydecoder, decrypt_script cannot read them)
+        from dusk_classifier import classify_file, WRAPPER, SIDECAR_FORMAT
+        encrypted_files = []
+        for f in sorted(os.listdir('.')):
+            if not f.endswith(('.py', '.pyw')):
+                continue
+            try:
+                kind, wrapper_format = classify_file(f)
+            except OSError:
+                continue
+            if kind == WRAPPER and wrapper_format != SIDECAR_FORMAT:
+                encrypted_files.append(f)
         if encrypted_files:
             print(
                 f"\n{Colors.GREEN}🔐 File terenkripsi yang tersedia:{Colors.END}"
@@ -327,6 +418,10 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
                 )
                 return
 
+            # One read and one decode: there is no progress to report until
+            # it is done, so single files get a timing line instead of a bar
+            started = time.perf_counter()
+            size = os.path.getsize(filename)
             with open(filename, 'r', encoding='utf-8') as f:
                 content = f.read()
 
@@ -335,18 +430,18 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
 
             decrypted_content = self.decrypt_script(content)
 
-            print(f"{Colors.GRAY}   {'█' * 40} 100%{Colors.END}")
+            print(f"{Colors.GRAY}   {format_size(size)} in "
+                  f"{time.perf_counter() - started:.2f}s{Colors.END}")
 
+            import pathlib
             base_name = pathlib.Path(filename).stem
             if base_name.endswith('_encrypted'):
                 base_name = base_name[:-10]  # Remove '_encrypted'
             output_file = f"{base_name}{self.decoded_suffix}.py"
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(decrypted_content)
+            self.writer.write(output_file, decrypted_content, mode=0o755)
 
-            if os.name == 'posix':
-                os.chmod(output_file, 0o755)
+            self.stats.record('decrypt', size, 1, time.perf_counter() - started)
 
             print(f"\n{Colors.GREEN}✅ Dekripsi berhasil!{Colors.END}")
             print(f"{Colors.MAGENTA}┌{'─' * 50}┐{Colors.END}")
@@ -384,57 +479,186 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         if not pattern:
             pattern = "*.py"
 
+        order = input(
+            f"{Colors.YELLOW}Processing order (size/dir) [size]: {Colors.END}"
+        ).strip().lower() or 'size'
+
         try:
             import glob
-            files = glob.glob(pattern)
+            plan, total_bytes = self.plan_batch(glob.glob(pattern), order)
 
-            if not files:
+            if not plan:
                 print(
                     f"{Colors.RED}❌ No files found matching pattern: {pattern}{Colors.END}"
                 )
                 return
 
             print(
-                f"{Colors.GREEN}Found {len(files)} files to process{Colors.END}"
+                f"{Colors.GREEN}Found {len(plan)} files to process ({format_size(total_bytes)}){Colors.END}"
             )
 
             success_count = 0
-            for file in files:
+            processed_bytes = 0
+            claimed = {}
+            progress = ProgressBar(total_bytes)
+            for file, size in plan:
                 try:
-                    if operation == 'encrypt':
-                        with open(file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        encoded_content = self.encrypt_script(content)
-                        encrypted_script = self.create_encrypted_script(
-                            encoded_content)
-                        base_name = pathlib.Path(file).stem
-                        output_file = f"{base_name}{self.obfuscated_suffix}.py"
-                        with open(output_file, 'w', encoding='utf-8') as f:
-                            f.write(encrypted_script)
-                    else:  # decrypt
-                        with open(file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        decrypted_content = self.decrypt_script(content)
-                        base_name = pathlib.Path(file).stem
-                        if base_name.endswith('_encrypted'):
-                            base_name = base_name[:-10]
-                        output_file = f"{base_name}{self.decoded_suffix}.py"
-                        with open(output_file, 'w', encoding='utf-8') as f:
-                            f.write(decrypted_content)
-
-                    print(f"{Colors.GREEN}✅ Processed: {file}{Colors.END}")
+                    self.process_batch_file(operation, file, claimed=claimed)
                     success_count += 1
-
+                    processed_bytes += size
                 except Exception as e:
+                    progress.clear_line()
                     print(f"{Colors.RED}❌ Failed: {file} - {e}{Colors.END}")
+                progress.update(size, os.path.basename(file))
 
+            elapsed = progress.finish()
+            self.stats.record(f'batch-{operation}', processed_bytes,
+                              success_count, elapsed)
+
+            rate = processed_bytes / elapsed if elapsed > 0 else 0
             print(
-                f"\n{Colors.CYAN}Batch operation completed: {success_count}/{len(files)} files processed{Colors.END}"
+                f"\n{Colors.CYAN}Batch operation completed: {success_count}/{len(plan)} files processed "
+                f"in {elapsed:.2f}s ({format_size(rate)}/s){Colors.END}"
             )
 
         except Exception as e:
             print(f"{Colors.RED}❌ Batch operation failed: {e}{Colors.END}")
 
+    def plan_batch(self, files, order='size'):
+        """Stat matched files and order them for processing.
+
+        Returns ([(path, size), ...], total_bytes). ``order`` is ``size``
+        (largest first, so the ETA settles early) or ``dir`` (grouped by
+        directory for disk locality).
+        """
+        plan = []
+        for file in files:
+            try:
+                st = os.stat(file)
+            except OSError:
+                continue
+            if os.path.isdir(file):
+                continue
+            plan.append((file, st.st_size))
+
+        if order == 'dir':
+            plan.sort(key=lambda item: (os.path.dirname(item[0]), item[0]))
+        else:
+            plan.sort(key=lambda item: item[1], reverse=True)
+
+        return plan, sum(size for _, size in plan)
+
+    def process_batch_file(self, operation, file, output_dir=None, claimed=None, rel=None):
+        """Encrypt or decrypt one file for a batch run, returns output path
+
+        ``rel`` is the input's path relative to the directory argument it
+        was found in; its directories are recreated under ``output_dir``.
+        Other inputs are named after their basename, so explicit files from
+        different directories can map to the same output. ``claimed`` maps
+        the outputs written so far in the run to their inputs; a clash is
+        an error instead of a silent overwrite.
+        """
+        import pathlib
+
+        with open(file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        base_name = pathlib.Path(file).stem
+        if operation == 'encrypt':
+            output = self.create_encrypted_script(self.encrypt_script(content))
+            output_file = f"{base_name}{self.obfuscated_suffix}.py"
+        else:
+            output = self.decrypt_script(content)
+            if base_name.endswith('_encrypted'):
+                base_name = base_name[:-10]
+            output_file = f"{base_name}{self.decoded_suffix}.py"
+
+        subdir = os.path.dirname(rel) if rel else ''
+        output_file = os.path.join(output_dir or '', subdir, output_file)
+        if subdir:
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+        if claimed is not None:
+            previous = claimed.setdefault(os.path.abspath(output_file), file)
+            if previous != file:
+                raise FileExistsError(f"{output_file} is already written from {previous}")
+
+        return self.writer.write(output_file, output)
+
+    def collect_inputs(self, paths, operation, recursive=True):
+        """Expand files and directories into the files an operation applies to.
+
+        Returns (file, relative path) pairs. Directories contribute their
+        Python files, relative to the directory: plain ones for ``encrypt``,
+        wrappers for ``decrypt`` (sidecar stubs are skipped: only pydecoder
+        reads their payload). Explicit files are kept as-is, relative path
+        being their basename.
+        """
+        from dusk_classifier import classify_file, WRAPPER, SIDECAR_FORMAT
+
+        files = []
+        for path in paths:
+            if not os.path.isdir(path):
+                files.append((path, os.path.basename(path)))
+                continue
+
+            if recursive:
+                found = []
+                for root, dirs, names in os.walk(path):
+                    dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d != '__pycache__')
+                    found.extend(os.path.join(root, name) for name in sorted(names))
+            else:
+                found = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+
+            for file in found:
+                if not file.endswith(tuple(self.supported_extensions)):
+                    continue
+                try:
+                    kind, wrapper_format = classify_file(file)
+                except OSError:
+                    continue
+                if wrapper_format == SIDECAR_FORMAT:
+                    continue  # Neither plain nor decodable here: pydecoder reads sidecars
+                is_wrapper = kind == WRAPPER
+                if is_wrapper == (operation == 'decrypt'):
+                    files.append((file, os.path.relpath(file, path)))
+        return files
+
+    def run_files(self, operation, plan, output_dir=None, progress=None, label=None,
+                  relpaths=None):
+        """Process planned (path, size) pairs without prompts.
+
+        ``relpaths`` maps inputs found in directories to their path relative
+        to that directory (see ``collect_inputs``). Returns (per-file
+        results, totals) and records the run in the stats under ``label``
+        (default: the operation name).
+        """
+        results = []
+        processed_bytes = 0
+        claimed = {}
+        started = time.perf_counter()
+
+        for file, size in plan:
+            result = {'input': file, 'output': None, 'bytes': size, 'error': None}
+            try:
+                result['output'] = self.process_batch_file(
+                    operation, file, output_dir, claimed, (relpaths or {}).get(file))
+                processed_bytes += size
+            except Exception as e:
+                result['error'] = str(e)
+            results.append(result)
+            if progress:
+                progress.update(size, os.path.basename(file))
+
+        elapsed = time.perf_counter() - started
+        succeeded = sum(1 for r in results if not r['error'])
+        self.stats.record(label or operation, processed_bytes, succeeded, elapsed)
+
+        totals = {'operation': operation, 'files': len(results), 'succeeded': succeeded,
+                  'failed': len(results) - succeeded, 'bytes': processed_bytes,
+                  'duration': round(elapsed, 6)}
+        return results, totals
+
     def handle_web_interface(self):
         """Launch web interface"""
         print(f"\n{Colors.CYAN}🌐 LAUNCHING WEB INTERFACE{Colors.END}")
@@ -465,38 +689,49 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         print(f"\n{Colors.CYAN}📁 FILE ANALYZER{Colors.END}")
         print(f"{Colors.GRAY}{'─' * 40}{Colors.END}")
 
-        filename = input(
-            f"{Colors.YELLOW}Enter file name to analyze: {Colors.END}").strip(
+        target = input(
+            f"{Colors.YELLOW}Enter file or directory to analyze: {Colors.END}").strip(
             )
 
-        if not filename or not os.path.exists(filename):
+        if not target or not os.path.exists(target):
             print(f"{Colors.RED}❌ File not found{Colors.END}")
             return
 
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                content = f.read()
+        from dusk_analyzer import FileAnalyzer
+        analyzer = FileAnalyzer()
+
+        if os.path.isdir(target):
+            self.analyze_directory(analyzer, target)
+            return
 
-            file_size = os.path.getsize(filename)
-            line_count = len(content.splitlines())
-            char_count = len(content)
+        try:
+            result = analyzer.analyze_file(target)
 
-            # Check if encrypted
-            is_encrypted = 'base64.b64decode' in content and (
-                'unknownkcc' in content or 'unknownkece' in content)
+            if result['error']:
+                status = f"Unparseable ({result['error']})"
+            elif result['encrypted']:
+                status = f"Encrypted ({result['codec']})"
+            else:
+                status = 'Plain Text'
 
             print(f"{Colors.GREEN}📊 File Analysis Results:{Colors.END}")
             print(
-                f"{Colors.GRAY}• File Size    : {Colors.CYAN}{file_size} bytes{Colors.END}"
+                f"{Colors.GRAY}• File Size    : {Colors.CYAN}{result['size']} bytes{Colors.END}"
+            )
+            print(
+                f"{Colors.GRAY}• Lines        : {Colors.CYAN}{result['lines']}{Colors.END}"
+            )
+            print(
+                f"{Colors.GRAY}• AST Nodes    : {Colors.CYAN}{result['nodes']}{Colors.END}"
             )
             print(
-                f"{Colors.GRAY}• Lines        : {Colors.CYAN}{line_count}{Colors.END}"
+                f"{Colors.GRAY}• Functions    : {Colors.CYAN}{result['functions']}{Colors.END}"
             )
             print(
-                f"{Colors.GRAY}• Characters   : {Colors.CYAN}{char_count}{Colors.END}"
+                f"{Colors.GRAY}• Classes      : {Colors.CYAN}{result['classes']}{Colors.END}"
             )
             print(
-                f"{Colors.GRAY}• Status       : {Colors.YELLOW}{'Encrypted' if is_encrypted else 'Plain Text'}{Colors.END}"
+                f"{Colors.GRAY}• Status       : {Colors.YELLOW}{status}{Colors.END}"
             )
             print(
                 f"{Colors.GRAY}• Type         : {Colors.CYAN}Python Script{Colors.END}"
@@ -505,6 +740,32 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         except Exception as e:
             print(f"{Colors.RED}❌ Analysis failed: {e}{Colors.END}")
 
+    def analyze_directory(self, analyzer, directory):
+        """Analyze a whole directory and print a table or JSON"""
+        output_format = input(
+            f"{Colors.YELLOW}Output format (table/json) [table]: {Colors.END}"
+        ).strip().lower() or 'table'
+
+        try:
+            started = time.perf_counter()
+            results, totals = analyzer.analyze_directory(directory)
+            elapsed = time.perf_counter() - started
+
+            if not results:
+                print(f"{Colors.RED}❌ No Python files found in {directory}{Colors.END}")
+                return
+
+            if output_format == 'json':
+                import json
+                print(json.dumps({'files': results, 'totals': totals}, indent=2))
+            else:
+                print(f"{Colors.GREEN}📊 Directory Analysis Results:{Colors.END}")
+                print(analyzer.format_table(results, totals))
+                print(f"{Colors.GRAY}Analyzed {totals['files']} files in {elapsed:.2f}s{Colors.END}")
+
+        except Exception as e:
+            print(f"{Colors.RED}❌ Analysis failed: {e}{Colors.END}")
+
     def handle_create_file(self):
         """Handle file creation with advanced options"""
         print(f"\n{Colors.CYAN}📝 CREATE NEW PYTHON FILE{Colors.END}")
@@ -676,6 +937,8 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
 
     def get_template(self, choice, filename="script"):
         """Get code template based on user choice"""
+        import pathlib
+        from datetime import datetime
         script_name = pathlib.Path(filename).stem if filename else "script"
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -1054,30 +1317,47 @@ if __name__ == "__main__":
         print(f"{Colors.MAGENTA}{'╚' + '═' * 48 + '╝'}{Colors.END}")
 
         try:
-            stats_file = ".dusk_stats.json"
-            if os.path.exists(stats_file):
-                with open(stats_file, 'r') as f:
-                    data = json.load(f)
-
-                print(f"\n{Colors.GREEN}📈 Laporan Statistik:{Colors.END}")
-                print(f"{Colors.MAGENTA}┌{'─' * 40}┐{Colors.END}")
-                print(
-                    f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Total Runs   : {Colors.CYAN}{str(data.get('total_runs', 0)):>23}{Colors.MAGENTA} │{Colors.END}"
-                )
-                print(
-                    f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Last Run     : {Colors.CYAN}{str(data.get('last_run', 'Never'))[:20]:>23}{Colors.MAGENTA} │{Colors.END}"
-                )
-                print(
-                    f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Version      : {Colors.CYAN}{('v' + self.version):>23}{Colors.MAGENTA} │{Colors.END}"
-                )
-                print(
-                    f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Platform     : {Colors.CYAN}{self.platform[:20]:>23}{Colors.MAGENTA} │{Colors.END}"
-                )
-                print(f"{Colors.MAGENTA}└{'─' * 40}┘{Colors.END}")
-            else:
+            data = self.stats.summary()
+            if not data['total_runs'] and not data['operations']:
                 print(
                     f"\n{Colors.YELLOW}💭 Belum ada statistik yang tersimpan{Colors.END}"
                 )
+                return
+
+            print(f"\n{Colors.GREEN}📈 Laporan Statistik:{Colors.END}")
+            print(f"{Colors.MAGENTA}┌{'─' * 40}┐{Colors.END}")
+            print(
+                f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Total Runs   : {Colors.CYAN}{str(data['total_runs']):>23}{Colors.MAGENTA} │{Colors.END}"
+            )
+            print(
+                f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Last Run     : {Colors.CYAN}{str(data['last_run'] or 'Never')[:20]:>23}{Colors.MAGENTA} │{Colors.END}"
+            )
+            print(
+                f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Version      : {Colors.CYAN}{('v' + self.version):>23}{Colors.MAGENTA} │{Colors.END}"
+            )
+            print(
+                f"{Colors.MAGENTA}│{Colors.END} {Colors.GRAY}Platform     : {Colors.CYAN}{self.platform[:20]:>23}{Colors.MAGENTA} │{Colors.END}"
+            )
+            print(f"{Colors.MAGENTA}└{'─' * 40}┘{Colors.END}")
+
+            operations = {op: totals for op, totals in data['operations'].items() if op != 'run'}
+            if operations:
+                print(f"\n{Colors.GREEN}⚙️  Per Operasi:{Colors.END}")
+                print(f"{Colors.GRAY}  {'Operation':<16}{'Count':>7}{'Files':>8}{'Bytes':>12}{'Time':>10}{Colors.END}")
+                for op, (count, files, nbytes, duration) in sorted(operations.items()):
+                    print(
+                        f"  {Colors.CYAN}{op:<16}{Colors.END}{count:>7}{files:>8}{format_size(nbytes):>12}{duration:>9.2f}s"
+                    )
+
+            rows = [row for row in self.stats.throughput_by_day() if row[1] != 'run']
+            if rows:
+                print(f"\n{Colors.GREEN}📅 Throughput (7 hari terakhir):{Colors.END}")
+                print(f"{Colors.GRAY}  {'Date':<12}{'Operation':<16}{'Files':>7}{'Bytes':>12}{'Rate':>14}{Colors.END}")
+                for day, op, files, nbytes, duration in rows:
+                    rate = f"{format_size(nbytes / duration)}/s" if duration > 0 else '-'
+                    print(
+                        f"  {day:<12}{Colors.CYAN}{op:<16}{Colors.END}{files:>7}{format_size(nbytes):>12}{Colors.YELLOW}{rate:>14}{Colors.END}"
+                    )
 
         except Exception as e:
             print(f"\n{Colors.RED}❌ Gagal memuat statistik: {e}{Colors.END}")
@@ -1105,8 +1385,9 @@ if __name__ == "__main__":
             print(f"{Colors.RED}❌ Error launching web interface: {e}{Colors.END}")
 
     def update_script(self):
-        os.system('clear')
         """Update script from GitHub repository"""
+        from datetime import datetime
+        self.clear_screen()
         print(f"\n{Colors.CYAN}🔄 SCRIPT UPDATE{Colors.END}")
         print(f"{Colors.MAGENTA}{'╔' + '═' * 48 + '╗'}{Colors.END}")
         print(
@@ -1266,7 +1547,7 @@ if __name__ == "__main__":
 
     def run_interactive_mode(self):
         """Run the interactive mode"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        self.clear_screen()
         self.print_banner()
         self.update_stats()
 
@@ -1307,14 +1588,130 @@ if __name__ == "__main__":
 
             input(f"\n{Colors.GRAY}Press Enter to continue...{Colors.END}")
             # Clear screen after user presses enter
-            os.system('clear' if os.name == 'posix' else 'cls')
+            self.clear_screen()
+
+
+def print_file_results(results, totals, as_json=False):
+    """Report per-file results of a non-interactive run"""
+    if as_json:
+        import json
+        print(json.dumps({'files': results, 'totals': totals}, indent=2))
+        return
+
+    for result in results:
+        if result['error']:
+            print(f"✗ {result['input']}: {result['error']}", file=sys.stderr)
+        else:
+            print(f"✓ {result['input']} -> {result['output']}")
+    print(f"{totals['succeeded']}/{totals['files']} files {totals['operation']}ed, "
+          f"{format_size(totals['bytes'])} in {totals['duration']:.2f}s", file=sys.stderr)
+
+
+def run_subcommand(cipher, args):
+    """Run one non-interactive subcommand, returns the exit code"""
+    import json
+
+    if args.command in ('encrypt', 'decrypt', 'batch'):
+        operation = args.operation if args.command == 'batch' else args.command
+        if args.command == 'batch':
+            import glob
+            files = [f for pattern in args.patterns for f in glob.glob(pattern, recursive=True)]
+            plan, total_bytes = cipher.plan_batch(files, args.order)
+            relpaths = None
+        else:
+            relpaths = dict(cipher.collect_inputs(args.paths, operation, not args.no_recursive))
+            plan, total_bytes = cipher.plan_batch(relpaths, 'dir')
+
+        if not plan:
+            print(f"✗ No files to {operation}", file=sys.stderr)
+            return 1
+
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+
+        progress = None
+        if args.command == 'batch' and not args.json and sys.stdout.isatty():
+            progress = ProgressBar(total_bytes)
+        label = f'batch-{operation}' if args.command == 'batch' else operation
+        cipher.writer = AtomicWriter(sync=args.fsync)
+        with cipher.writer:
+            results, totals = cipher.run_files(operation, plan, args.output_dir, progress, label,
+                                               relpaths)
+        if progress:
+            progress.finish()
+
+        print_file_results(results, totals, args.json)
+        return 1 if totals['failed'] else 0
+
+    if args.command == 'analyze':
+        from dusk_analyzer import FileAnalyzer
+        analyzer = FileAnalyzer(use_cache=not args.no_cache, workers=args.jobs)
+
+        try:
+            if os.path.isdir(args.path):
+                results, totals = analyzer.analyze_directory(args.path, not args.no_recursive)
+            else:
+                results = [analyzer.analyze_file(args.path)]
+                totals = analyzer.aggregate(results)
+        except Exception as e:
+            print(f"✗ Analysis failed: {e}", file=sys.stderr)
+            return 1
+
+        if args.json:
+            print(json.dumps({'files': results, 'totals': totals}, indent=2))
+        else:
+            print(analyzer.format_table(results, totals))
+        return 0
+
+    if args.command == 'stats':
+        data = cipher.stats.summary()
+        rows = cipher.stats.throughput_by_day(args.days)
+
+        if args.json:
+            data['throughput'] = [
+                {'day': day, 'operation': op, 'files': files, 'bytes': nbytes,
+                 'duration': duration}
+                for day, op, files, nbytes, duration in rows
+            ]
+            print(json.dumps(data, indent=2))
+            return 0
+
+        print(f"Total runs : {data['total_runs']}")
+        print(f"Last run   : {data['last_run'] or 'Never'}")
+        print(f"\n{'Operation':<16}{'Count':>7}{'Files':>8}{'Bytes':>12}{'Time':>10}")
+        for op, (count, files, nbytes, duration) in sorted(data['operations'].items()):
+            print(f"{op:<16}{count:>7}{files:>8}{format_size(nbytes):>12}{duration:>9.2f}s")
+        if rows:
+            print(f"\n{'Date':<12}{'Operation':<16}{'Files':>7}{'Bytes':>12}{'Rate':>14}")
+            for day, op, files, nbytes, duration in rows:
+                rate = f"{format_size(nbytes / duration)}/s" if duration > 0 else '-'
+                print(f"{day:<12}{op:<16}{files:>7}{format_size(nbytes):>12}{rate:>14}")
+        return 0
+
+    return 2
 
 
 def main():
     """Main function"""
+    # Interactive mode needs no argument parsing
+    if len(sys.argv) == 1:
+        DuskCipher().run_interactive_mode()
+        return 0
+
+    import argparse
+    import pathlib
+
     parser = argparse.ArgumentParser(
         description='DUSK CIPHER - Professional Encryption Toolkit',
-        formatter_class=argparse.RawDescriptionHelpFormatter)
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Subcommands run without banner or prompts:
+  %(prog)s encrypt app.py src/           Encrypt files and directories
+  %(prog)s decrypt build/ -o out --json  Decrypt wrappers, JSON report
+  %(prog)s batch encrypt "src/**/*.py"   Batch run over glob patterns
+  %(prog)s analyze src/ --json           AST metrics for a file or directory
+  %(prog)s stats --json                  Usage statistics
+        """)
 
     parser.add_argument('--encrypt', '-e', help='Encrypt a Python file')
 
@@ -1333,21 +1730,61 @@ def main():
                         action='version',
                         version='DUSK CIPHER v3.0')
 
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+
+    for name, help_text in (('encrypt', 'Encrypt files or directories of plain scripts'),
+                            ('decrypt', 'Decrypt files or directories of wrappers')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('paths', nargs='+', help='Files or directories')
+        sub.add_argument('-o', '--output-dir', help='Write outputs here (default: current directory)')
+        sub.add_argument('-n', '--no-recursive', action='store_true',
+                         help='Only use the top level of directories')
+        sub.add_argument('--fsync', choices=SYNC_POLICIES, default='none',
+                         help='Durability of written files (default: none)')
+        sub.add_argument('--json', action='store_true', help='Print a JSON report')
+
+    sub = subparsers.add_parser('batch', help='Batch encrypt/decrypt files matching glob patterns')
+    sub.add_argument('operation', choices=['encrypt', 'decrypt'])
+    sub.add_argument('patterns', nargs='*', default=['*.py'], help='Glob patterns (default: *.py)')
+    sub.add_argument('--order', choices=['size', 'dir'], default='size',
+                     help='Processing order (default: size)')
+    sub.add_argument('-o', '--output-dir', help='Write outputs here (default: current directory)')
+    sub.add_argument('--fsync', choices=SYNC_POLICIES, default='none',
+                     help='Durability of written files (default: none)')
+    sub.add_argument('--json', action='store_true', help='Print a JSON report')
+
+    sub = subparsers.add_parser('analyze', help='Analyze a file or directory')
+    sub.add_argument('path', help='File or directory')
+    sub.add_argument('-n', '--no-recursive', action='store_true',
+                     help='Only analyze the top-level directory')
+    sub.add_argument('-j', '--jobs', type=int, help='Worker processes (default: CPU count)')
+    sub.add_argument('--no-cache', action='store_true', help='Ignore and do not write the result cache')
+    sub.add_argument('--json', action='store_true', help='Print JSON')
+
+    sub = subparsers.add_parser('stats', help='Show usage statistics')
+    sub.add_argument('--days', type=int, default=7, help='Days of throughput history (default: 7)')
+    sub.add_argument('--json', action='store_true', help='Print JSON')
+
     args = parser.parse_args()
 
     cipher = DuskCipher()
 
+    if args.command:
+        return run_subcommand(cipher, args)
+
     # Handle command line arguments
     if args.encrypt:
         try:
+            started = time.perf_counter()
             with open(args.encrypt, 'r', encoding='utf-8') as f:
                 content = f.read()
             encoded_content = cipher.encrypt_script(content)
             encrypted_script = cipher.create_encrypted_script(encoded_content)
             base_name = pathlib.Path(args.encrypt).stem
             output_file = f"{base_name}{cipher.obfuscated_suffix}.py"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(encrypted_script)
+            cipher.writer.write(output_file, encrypted_script)
+            cipher.stats.record('encrypt', os.path.getsize(args.encrypt), 1,
+                                time.perf_counter() - started)
             print(f"✅ Encrypted: {args.encrypt} -> {output_file}")
         except Exception as e:
             print(f"❌ Encryption failed: {e}")
@@ -1355,6 +1792,7 @@ def main():
 
     if args.decrypt:
         try:
+            started = time.perf_counter()
             with open(args.decrypt, 'r', encoding='utf-8') as f:
                 content = f.read()
             decrypted_content = cipher.decrypt_script(content)
@@ -1362,8 +1800,9 @@ def main():
             if base_name.endswith('_encrypted'):
                 base_name = base_name[:-10]
             output_file = f"{base_name}{cipher.decoded_suffix}.py"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(decrypted_content)
+            cipher.writer.write(output_file, decrypted_content)
+            cipher.stats.record('decrypt', os.path.getsize(args.decrypt), 1,
+                                time.perf_counter() - started)
             print(f"✅ Decrypted: {args.decrypt} -> {output_file}")
         except Exception as e:
             print(f"❌ Decryption failed: {e}")
@@ -1377,16 +1816,16 @@ def main():
             print(f"❌ Failed to start web interface: {e}")
         return
 
-    # Run interactive mode if no arguments
-    if len(sys.argv) == 1:
-        cipher.run_interactive_mode()
-    else:
-        parser.print_help()
+    parser.print_help()
 
 
 if __name__ == '__main__':
     try:
-        main()
+        sys.exit(main())
+    except BrokenPipeError:
+        # Output piped into a reader that exited early (e.g. head)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except KeyboardInterrupt:
         print(f"\n{Colors.RED}Operation cancelled by user{Colors.END}")
         sys.exit(1)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Wrapper Classifier
+Decides whether a file is plain Python or an obfuscated wrapper by reading
+only its first few KB (wrapper prologue and payload assignment header).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import re
+
+HEADER_SIZE = 4096
+
+PLAIN = 'plain'
+WRAPPER = 'wrapper'
+UNKNOWN = 'unknown'
+
+# Codec modules a wrapper prologue may import, in decode order
+CODEC_MODULES = ('base64', 'binascii', 'zlib', 'bz2', 'lzma', 'marshal')
+
+# First comment of a stub whose payload lives in a sidecar file, and the
+# sidecar's suffix (it replaces the stub's .py)
+SIDECAR_MARKER = '# dusk-sidecar:'
+SIDECAR_FORMAT = 'zlib:sidecar'
+SIDECAR_SUFFIX = '.duskz'
+
+# Shortest payload accepted from a truncated header that does not show the
+# exec/eval; ordinary string constants are shorter
+MIN_PAYLOAD = 256
+
+_IMPORT_RE = re.compile(
+    r'(?:import\s+([\w\s,]+)|from\s+(\w+)\s+import\s+[\w\s,()]+)\s*(?:#.*)?$')
+_ASSIGN_RE = re.compile(r'(\w+)\s*=\s*[bB]?("""|\'\'\'|"|\')([A-Za-z0-9+/=\s]*)')
+_INLINE_RE = re.compile(r'\b(?:\w+\.)?b64decode\(\s*[bB]?["\']([A-Za-z0-9+/=]+)')
+_BASE64_CHARS = re.compile(rb'[A-Za-z0-9+/=\s]{64,}')
+_DECODE_CALL_RE = re.compile(r'\b(?:b(?:64|32|16|85)decode|a85decode|decompress|marshal\.loads)\s*\(')
+
+
+def classify_header(head: bytes, size: int) -> tuple[str, str | None]:
+    """Classify a file from its first bytes and its total size.
+
+    Returns (kind, format) where kind is ``plain``, ``wrapper`` or
+    ``unknown`` and format describes the wrapper, e.g. ``base64:triple``
+    (or ``zlib:sidecar`` for a stub with its payload in a sidecar file).
+    """
+    try:
+        text = head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # The header may end inside a multi-byte character
+        if e.start < len(head) - 3:
+            return UNKNOWN, None
+        text = head[:e.start].decode('utf-8')
+
+    codecs = []
+    complete = size <= len(head)
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(SIDECAR_MARKER) and not codecs:
+            return WRAPPER, SIDECAR_FORMAT
+        if not stripped or stripped.startswith('#'):
+            continue
+
+        match = _IMPORT_RE.match(stripped)
+        if match:
+            # Other modules may share the line ("import sys, base64")
+            modules = (match.group(1) or match.group(2) or '').replace(' ', '').split(',')
+            codecs.extend(m for m in modules if m in CODEC_MODULES and m not in codecs)
+            codecs.sort(key=CODEC_MODULES.index)
+            continue
+
+        if not codecs:
+            break
+
+        # A whole file must also execute the payload
+        executes = 'exec(' in text or 'eval(' in text
+        if complete and not executes:
+            return PLAIN, None
+
+        # The payload must reach an exec/eval on its line (a string constant
+        # next to an unrelated eval() is no wrapper); a truncated header that
+        # does not show it needs at least a substantial payload
+        match = _ASSIGN_RE.match(stripped)
+        feeds = match and re.search(r'\b(?:exec|eval)\(.*\b%s\b' % re.escape(match.group(1)), text)
+        if match and (feeds or not complete and len(match.group(3).strip()) >= MIN_PAYLOAD):
+            quote = 'triple' if len(match.group(2)) == 3 else 'single'
+            return WRAPPER, f"{'+'.join(codecs)}:{quote}"
+
+        if _INLINE_RE.search(stripped):
+            return WRAPPER, f"{'+'.join(codecs)}:inline"
+
+        # Codecs imported, but not in a layout recognized here
+        return UNKNOWN, None
+
+    if codecs:
+        # Codec imports but no payload inside the header
+        return UNKNOWN, None
+
+    # Decode calls after other code: possibly a wrapper with a longer prologue
+    if _DECODE_CALL_RE.search(text):
+        return UNKNOWN, None
+
+    # Long unbroken base64 with no recognizable prologue: an unknown wrapper
+    # style, or a raw payload file
+    if _BASE64_CHARS.match(head.lstrip()):
+        return UNKNOWN, None
+
+    return PLAIN, None
+
+
+def classify_file(path: str, header_size: int = HEADER_SIZE) -> tuple[str, str | None]:
+    """Classify a file with one small read."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        head = f.read(header_size)
+    return classify_header(head, size)
+
+
+def main():
+    """Main function to classify files from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='DUSK CIPHER Wrapper Classifier - Triage plain vs obfuscated Python files')
+    parser.add_argument('paths', nargs='+', help='Files or directories to classify')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Recurse into directories')
+    parser.add_argument('-k', '--kind', choices=[PLAIN, WRAPPER, UNKNOWN],
+                        help='Only list files of this kind')
+
+    args = parser.parse_args()
+    counts = {PLAIN: 0, WRAPPER: 0, UNKNOWN: 0}
+
+    def iter_files():
+        for path in args.paths:
+            if not os.path.isdir(path):
+                yield path
+            elif args.recursive:
+                for root, _, files in os.walk(path):
+                    for name in sorted(files):
+                        if name.endswith(('.py', '.pyw')):
+                            yield os.path.join(root, name)
+            else:
+                for name in sorted(os.listdir(path)):
+                    if name.endswith(('.py', '.pyw')):
+                        yield os.path.join(path, name)
+
+    for path in iter_files():
+        try:
+            kind, fmt = classify_file(path)
+        except OSError as e:
+            print(f"✗ {path}: {e}", file=sys.stderr)
+            continue
+        counts[kind] += 1
+        if args.kind is None or args.kind == kind:
+            print(f"{kind:<8} {fmt or '-':<20} {path}")
+
+    print(f"\n{counts[WRAPPER]} wrapper, {counts[PLAIN]} plain, {counts[UNKNOWN]} unknown",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
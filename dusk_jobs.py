@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Background Jobs
+Asynchronous jobs for the web server. A submission gets an id right away and
+runs later on a small, fixed set of background threads behind a bounded
+queue; the client polls for status and fetches the result when it is done,
+so no HTTP connection is held open for the length of the work.
+
+Job state and results are files in one directory, which pre-fork workers
+share: any worker can answer for a job another one runs. Finished jobs
+expire after a TTL, and the directory is capped in bytes and job count by
+evicting the oldest finished jobs first.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import queue
+import shutil
+import secrets
+import tempfile
+import threading
+
+from dusk_admission import Overloaded
+
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_MAX_PENDING = 64
+DEFAULT_RESULT_TTL = 600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_JOBS = 1000
+
+# Seconds between expiry sweeps while the job threads are idle
+SWEEP_INTERVAL = 30.0
+
+# Retry hint for submissions rejected because the queue is full
+RETRY_AFTER = 5
+
+# Temp files untouched this long are left over from a failed write
+STALE_TMP_AGE = 300.0
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+FINISHED = (DONE, FAILED)
+
+
+class Job:
+    """A submitted job, as seen by the thread running it."""
+
+    def __init__(self, store: JobStore, info: dict):
+        self.store = store
+        self.info = info
+
+    @property
+    def id(self) -> str:
+        return self.info['id']
+
+    def update(self, **fields) -> None:
+        """Record progress or state (stage, done, total, ...) for pollers.
+
+        Also stamps ``updated``, so pollers can tell a stalled job from a
+        slow one.
+        """
+        self.info.update(fields, updated=time.time())
+        self.store._write_info(self.info)
+
+
+class JobStore:
+    """Bounded background executor plus a shared on-disk status/result store.
+
+    ``directory`` None means a private temporary directory, removed on
+    close(); pre-fork servers pass one directory to every worker. Threads
+    start on first submit, so a store can be created before the fork.
+    """
+
+    def __init__(self, directory: str | None = None, workers: int = DEFAULT_JOB_WORKERS,
+                 max_pending: int = DEFAULT_MAX_PENDING, ttl: float = DEFAULT_RESULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_jobs: int = DEFAULT_MAX_JOBS):
+        if workers < 1:
+            raise ValueError(f"Job workers must be at least 1: {workers}")
+        self.owns_directory = directory is None
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='dusk-jobs-')
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.workers = workers
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_jobs = max_jobs
+        self.queue = queue.Queue(max_pending)
+        self.running = 0
+        self.threads = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self) -> None:
+        with self._lock:
+            if self.threads:
+                return
+            if self._closed:
+                raise RuntimeError("Job store is closed")
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'job-{n}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, func, **fields) -> Job:
+        """Queue ``func(job)``, which returns the result as bytes.
+
+        ``fields`` are stored with the job status. Raises Overloaded when
+        the queue is full.
+        """
+        if not self.threads:
+            self._start()
+        job = Job(self, {'id': secrets.token_hex(16), 'status': QUEUED, 'pid': os.getpid(),
+                         'created': time.time(), 'started': None, 'finished': None, **fields})
+        job.update()
+        try:
+            self.queue.put_nowait((job, func))
+        except queue.Full:
+            self._remove(job.id)
+            raise Overloaded('job queue full', RETRY_AFTER)
+        return job
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self.queue.get(timeout=SWEEP_INTERVAL)
+            except queue.Empty:
+                self.evict()
+                continue
+            if item is None:
+                return
+
+            job, func = item
+            with self._lock:
+                self.running += 1
+            try:
+                job.update(status=RUNNING, started=time.time())
+                result = func(job)
+                self._write(self._path(job.id, '.out'), result)
+                job.update(status=DONE, size=len(result), finished=time.time())
+            except Exception as e:
+                try:
+                    job.update(status=FAILED, error=str(e) or type(e).__name__, finished=time.time())
+                except OSError:
+                    pass  # Store directory gone (shutting down)
+            finally:
+                with self._lock:
+                    self.running -= 1
+            self.evict()
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, job_id + suffix)
+
+    def _write(self, path: str, data: bytes) -> None:
+        # Readers in other processes must never see a half-written file
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _write_info(self, info: dict) -> None:
+        self._write(self._path(info['id'], '.json'), json.dumps(info).encode('utf-8'))
+
+    def _remove(self, job_id: str) -> None:
+        for suffix in ('.out', '.json'):
+            try:
+                os.unlink(self._path(job_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _expired(self, info: dict) -> bool:
+        return info['finished'] is not None and time.time() - info['finished'] > self.ttl
+
+    def get(self, job_id: str) -> dict | None:
+        """Status of a job, or None if unknown or expired."""
+        if not _valid_id(job_id):
+            return None
+        try:
+            with open(self._path(job_id, '.json'), 'rb') as f:
+                info = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if self._expired(info):
+            return None
+        if info['status'] not in FINISHED and not _alive(info['pid']):
+            # Its owner died (e.g. a restarted pre-fork worker); settle it once
+            info.update(status=FAILED, error='Proses server yang menjalankan job berhenti',
+                        finished=time.time())
+            try:
+                self._write_info(info)
+            except OSError:
+                pass
+        return info
+
+    def result(self, job_id: str) -> bytes | None:
+        """Result of a finished job, or None if it is gone."""
+        if not _valid_id(job_id):
+            return None
+        try:
+            with open(self._path(job_id, '.out'), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def evict(self) -> None:
+        """Drop expired jobs, then the oldest finished ones while over the caps.
+
+        Also sweeps temp files left by writers that died mid-write.
+        """
+        finished = []
+        total_bytes = count = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.tmp'):
+                self._remove_stale_tmp(name)
+                continue
+            if not name.endswith('.json'):
+                continue
+            info = self.get(name[:-5])
+            if info is None:
+                self._remove_expired(name[:-5])
+                continue
+            count += 1
+            total_bytes += info.get('size', 0)
+            if info['status'] in FINISHED:
+                finished.append((info['finished'], info.get('size', 0), info['id']))
+
+        finished.sort()
+        for _, size, job_id in finished:
+            if total_bytes <= self.max_bytes and count <= self.max_jobs:
+                break
+            self._remove(job_id)
+            total_bytes -= size
+            count -= 1
+
+    def _remove_stale_tmp(self, name: str) -> None:
+        # Name is "<job file>.<pid>.<thread>.tmp": stale once its writer
+        # process is gone, or when nothing has written to it for a while
+        path = os.path.join(self.directory, name)
+        parts = name.split('.')
+        try:
+            if (len(parts) == 5 and parts[2].isdigit() and _alive(int(parts[2]))
+                    and time.time() - os.stat(path).st_mtime < STALE_TMP_AGE):
+                return
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _remove_expired(self, job_id: str) -> None:
+        # get() returned None: expired, unreadable or mid-replace; only
+        # remove what is really expired
+        try:
+            with open(self._path(job_id, '.json'), 'rb') as f:
+                info = json.loads(f.read())
+        except (OSError, ValueError):
+            return
+        if self._expired(info):
+            self._remove(job_id)
+
+    def stats(self) -> dict:
+        return {'workers': self.workers, 'running': self.running, 'pending': self.queue.qsize()}
+
+    def close(self) -> None:
+        """Stop the job threads; queued and running jobs are abandoned."""
+        with self._lock:
+            self._closed = True
+            threads, self.threads = self.threads, []
+        for _ in threads:
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                break  # Daemon threads; they die with the process
+        if self.owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _valid_id(job_id: str) -> bool:
+    # Also keeps ids from naming paths outside the store
+    return len(job_id) == 32 and all(c in '0123456789abcdef' for c in job_id)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Runtime Loader
+Import hook that loads encoded modules from a payload store produced by
+``pyobfuscator.py --store``, so obfuscated code imports like normal modules.
+
+Usage:
+    import dusk_loader
+    dusk_loader.install('/path/to/store')
+    import mymodule
+
+    python3 dusk_loader.py -p /path/to/store mymodule [args...]
+"""
+
+import os
+import sys
+import binascii
+from importlib.machinery import ModuleSpec
+
+PAYLOAD_SUFFIX = '.dusk'
+
+# Code objects keyed by payload path, validated against (mtime, size)
+_code_cache = {}
+
+
+def decode_payload(data: bytes) -> bytes:
+    """Decode a base64 payload back to the original source bytes."""
+    return binascii.a2b_base64(data)
+
+
+def source_name(path: str) -> str:
+    """File name compiled into a payload's code objects.
+
+    The ``.py`` name next to the payload normally does not exist, so
+    linecache (tracebacks, inspect) falls back to the module's loader and
+    shows decoded source instead of the payload's base64 text, without
+    having to import linecache up front.
+    """
+    return os.path.splitext(path)[0] + '.py'
+
+
+# Finder and loader follow the importlib protocols without subclassing
+# importlib.abc, which would pull typing and importlib.resources into startup
+class DuskLoader:
+    """Loader that decodes and compiles a single payload file on demand."""
+
+    def __init__(self, fullname, path, is_package):
+        self.fullname = fullname
+        self.path = path
+        self._is_package = is_package
+
+    def is_package(self, fullname):
+        return self._is_package
+
+    def get_filename(self, fullname):
+        return self.path
+
+    def get_source(self, fullname):
+        with open(self.path, 'rb') as f:
+            return decode_payload(f.read()).decode('utf-8')
+
+    def get_code(self, fullname):
+        st = os.stat(self.path)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _code_cache.get(self.path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        with open(self.path, 'rb') as f:
+            source = decode_payload(f.read())
+        code = compile(source, source_name(self.path), 'exec', dont_inherit=True)
+        _code_cache[self.path] = (key, code)
+        return code
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        code = self.get_code(module.__name__)
+        exec(code, module.__dict__)
+
+
+class DuskFinder:
+    """Meta path finder resolving module names to payloads in store directories."""
+
+    def __init__(self, paths=None):
+        self.paths = list(paths) if paths else []
+
+    def find_spec(self, fullname, path=None, target=None):
+        name = fullname.rpartition('.')[2]
+        search_paths = path if path is not None else (self.paths or sys.path)
+
+        for entry in search_paths:
+            entry = entry or '.'
+            package_init = os.path.join(entry, name, '__init__' + PAYLOAD_SUFFIX)
+            if os.path.isfile(package_init):
+                loader = DuskLoader(fullname, package_init, True)
+                spec = ModuleSpec(fullname, loader, origin=package_init, is_package=True)
+                spec.submodule_search_locations.append(os.path.join(entry, name))
+                spec.has_location = True
+                return spec
+
+            module_file = os.path.join(entry, name + PAYLOAD_SUFFIX)
+            if os.path.isfile(module_file):
+                loader = DuskLoader(fullname, module_file, False)
+                spec = ModuleSpec(fullname, loader, origin=module_file)
+                spec.has_location = True
+                return spec
+
+        return None
+
+    def invalidate_caches(self):
+        _code_cache.clear()
+
+
+def install(*paths) -> DuskFinder:
+    """Register the payload finder on ``sys.meta_path`` (idempotent)."""
+    for finder in sys.meta_path:
+        if isinstance(finder, DuskFinder):
+            for p in paths:
+                if p not in finder.paths:
+                    finder.paths.append(p)
+            return finder
+
+    # Must run before PathFinder, which would claim store subdirectories
+    # as namespace packages
+    finder = DuskFinder(paths)
+    position = len(sys.meta_path)
+    for i, existing in enumerate(sys.meta_path):
+        if getattr(existing, '__name__', None) == 'PathFinder':
+            position = i
+            break
+    sys.meta_path.insert(position, finder)
+    return finder
+
+
+def run_module(name, *paths, argv=None):
+    """Run an encoded module as ``__main__``, like ``python -m``."""
+    import runpy
+
+    install(*paths)
+    if argv is not None:
+        sys.argv = [name] + list(argv)
+    return runpy.run_module(name, run_name='__main__', alter_sys=True)
+
+
+def split_args(argv: list):
+    """Split ``[-p DIR]... module [args...]`` without argparse.
+
+    Returns (paths, module, args), or None for anything else (help,
+    unknown options, errors), which argparse then handles. Running a
+    module is the hot path, and argparse alone would cost more than the
+    rest of the loader's startup.
+    """
+    paths = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ('-p', '--path'):
+            if i + 1 == len(argv):
+                return None
+            paths.append(argv[i + 1])
+            i += 2
+        elif arg.startswith('--path='):
+            paths.append(arg[len('--path='):])
+            i += 1
+        elif arg.startswith('-p') and not arg.startswith('--'):
+            paths.append(arg[2:])
+            i += 1
+        elif arg.startswith('-'):
+            return None
+        else:
+            return paths, arg, argv[i + 1:]
+    return None
+
+
+def main():
+    """Main function to run an encoded module from the command line."""
+    split = split_args(sys.argv[1:])
+    if split is not None:
+        paths, module, module_args = split
+    else:
+        paths, module, module_args = parse_args()
+
+    try:
+        run_module(module, *(paths or [os.getcwd()]), argv=module_args)
+    except Exception:
+        # The interpreter's own handler reads source lines straight from the
+        # file, which does not exist; traceback goes through the loader
+        import traceback
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def parse_args():
+    """Full argparse parsing, for --help and malformed command lines."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='DUSK CIPHER Runtime Loader - Run modules from an encoded payload store')
+    parser.add_argument('-p', '--path', action='append', default=[],
+                        help='Payload store directory (can be repeated)')
+    parser.add_argument('module', help='Module name to run as __main__')
+    parser.add_argument('args', nargs=argparse.REMAINDER,
+                        help='Arguments passed to the module')
+
+    args = parser.parse_args()
+    return args.path, args.module, args.args
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Output Writer
+Atomic file output: every file is written to a temp file in the destination
+directory and renamed over the target, so a crash never leaves a truncated
+output behind. ArchiveWriter collects outputs into one reproducible
+tar/zip archive instead.
+
+Durability policies:
+  none   rename only, data reaches disk when the kernel flushes it
+  file   fsync each file and its directory before returning
+  batch  defer renames to the end of the batch, flush the filesystem once,
+         rename everything and fsync each touched directory once
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+SYNC_POLICIES = ('none', 'file', 'batch')
+
+# The umask can only be read by setting it, which is not thread-safe; read
+# it once at import (a restrictive value covers the instant it is changed)
+_UMASK = os.umask(0o077)
+os.umask(_UMASK)
+
+
+class AtomicWriter:
+    """Write files atomically with a configurable fsync policy.
+
+    Use as a context manager so batch-mode writes are committed on success
+    and discarded on error.
+    """
+
+    # Writes may land in any order, from several threads
+    ordered = False
+
+    def __init__(self, sync: str = 'none', mode: int = 0o666):
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"Unknown sync policy: {sync}")
+        self.sync = sync
+        self.mode = mode
+        self.pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def write(self, path: str, data: str | bytes, mode: int | None = None) -> str:
+        """Write data to path atomically, returns path.
+
+        The temp file gets a fresh, unpredictable name (created with
+        O_EXCL, so it never follows a planted symlink) and ``mode`` minus
+        the umask. In batch mode the target only appears on commit().
+        """
+        import tempfile
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        path = os.fspath(path)
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp',
+                                        dir=directory)
+        try:
+            _set_mode(fd, tmp_path, self.mode if mode is None else mode)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if self.sync == 'file':
+                os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            self._remove(tmp_path)
+            raise
+        os.close(fd)
+
+        if self.sync == 'batch':
+            self._stage(path, tmp_path)
+            return path
+
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        if self.sync == 'file':
+            self._fsync_directory(directory)
+        return path
+
+    def link(self, existing: str, path: str) -> str:
+        """Hardlink an output written by this writer to another path, returns path.
+
+        Raises OSError where hardlinks are not possible (other filesystem,
+        no support); callers then fall back to write().
+        """
+        path = os.fspath(path)
+        existing = os.fspath(existing)
+        if path == existing:
+            return path
+        source = self.pending.get(existing, existing)
+        directory = os.path.dirname(path) or '.'
+        # link() never replaces an existing name, so a random one is enough
+        tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.urandom(8).hex()}.tmp")
+
+        os.link(source, tmp_path)
+
+        if self.sync == 'batch':
+            self._stage(path, tmp_path)
+            return path
+
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        if self.sync == 'file':
+            self._fsync_directory(directory)
+        return path
+
+    def commit(self) -> int:
+        """Make pending batch writes durable and visible, returns file count."""
+        if not self.pending:
+            return 0
+
+        pending, self.pending = self.pending, {}
+        try:
+            self._flush(list(pending.values()))
+            directories = set()
+            for path, tmp_path in pending.items():
+                os.replace(tmp_path, path)
+                directories.add(os.path.dirname(path) or '.')
+        except BaseException:
+            for tmp_path in pending.values():
+                self._remove(tmp_path)
+            raise
+
+        for directory in sorted(directories):
+            self._fsync_directory(directory)
+        return len(pending)
+
+    def abort(self) -> None:
+        """Discard pending batch writes."""
+        pending, self.pending = self.pending, {}
+        for tmp_path in pending.values():
+            self._remove(tmp_path)
+
+    def _flush(self, paths: list[str]) -> None:
+        """Get file data on disk: one syncfs per filesystem where available."""
+        synced = set()
+        for path in paths:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                device = os.fstat(fd).st_dev
+                if device in synced:
+                    continue
+                if _syncfs(fd):
+                    synced.add(device)
+                else:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _fsync_directory(self, directory: str) -> None:
+        if os.name != 'posix':
+            return  # Directories cannot be opened for fsync on Windows
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _stage(self, path: str, tmp_path: str) -> None:
+        """Queue a batch write; a later write to the same path replaces it."""
+        previous = self.pending.get(path)
+        self.pending[path] = tmp_path
+        if previous is not None:
+            self._remove(previous)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _set_mode(fd: int, path: str, mode: int) -> None:
+    """Give a new file ``mode`` minus the umask, like os.open() would."""
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, mode & ~_UMASK)
+    else:
+        os.chmod(path, mode & ~_UMASK)
+
+
+_libc = None
+
+
+def _syncfs(fd: int) -> bool:
+    """Flush the whole filesystem holding fd (Linux syncfs). False if unsupported."""
+    global _libc
+    if not sys.platform.startswith('linux'):
+        return False
+    if _libc is None:
+        import ctypes
+        try:
+            _libc = ctypes.CDLL(None, use_errno=True)
+            _libc.syncfs
+        except (OSError, AttributeError):
+            _libc = False
+    return bool(_libc) and _libc.syncfs(fd) == 0
+
+
+class ArchiveWriter:
+    """Stream outputs into a single tar, tar.gz or zip archive.
+
+    Same write() interface as AtomicWriter. Member metadata is fixed
+    (timestamp from SOURCE_DATE_EPOCH, owner root, no names in the gzip
+    header) so the same inputs in the same order give a byte-identical
+    archive. The archive is built under a temp name and renamed on commit().
+    """
+
+    # Members must be added in input order, one at a time
+    ordered = True
+
+    def __init__(self, archive_path: str, base_dir: str | None = None, sync: str = 'none',
+                 mode: int = 0o644):
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"Unknown sync policy: {sync}")
+        name = archive_path.lower()
+        if name.endswith('.zip'):
+            self.kind = 'zip'
+        elif name.endswith(('.tar.gz', '.tgz')):
+            self.kind = 'tar.gz'
+        elif name.endswith('.tar'):
+            self.kind = 'tar'
+        else:
+            raise ValueError(f"Unsupported archive type (use .tar, .tar.gz or .zip): {archive_path}")
+
+        self.archive_path = archive_path
+        self.base_dir = base_dir
+        self.sync = sync
+        self.mode = mode
+        # Zip cannot store dates before 1980
+        self.mtime = max(int(os.environ.get('SOURCE_DATE_EPOCH', 0)), 315532800)
+        self.members = set()
+        self.tmp_path = None
+        self._raw = None
+        self._gzip = None
+        self._archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def _open(self) -> None:
+        import tempfile
+
+        fd, self.tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.archive_path)}.",
+                                             suffix='.tmp',
+                                             dir=os.path.dirname(self.archive_path) or '.')
+        try:
+            _set_mode(fd, self.tmp_path, 0o666)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._raw = os.fdopen(fd, 'wb')
+        if self.kind == 'zip':
+            import zipfile
+            self._archive = zipfile.ZipFile(self._raw, 'w', zipfile.ZIP_DEFLATED)
+            return
+
+        import tarfile
+        fileobj = self._raw
+        if self.kind == 'tar.gz':
+            import gzip
+            self._gzip = gzip.GzipFile(filename='', mode='wb', fileobj=self._raw, mtime=self.mtime)
+            fileobj = self._gzip
+        self._archive = tarfile.open(fileobj=fileobj, mode='w', format=tarfile.GNU_FORMAT)
+
+    def member_name(self, path: str) -> str:
+        """Archive member name for an output path: relative to base_dir, else the file name."""
+        path = os.fspath(path)
+        if self.base_dir:
+            name = os.path.relpath(path, self.base_dir)
+            if not name.startswith(os.pardir):
+                return name.replace(os.sep, '/')
+        return os.path.basename(path)
+
+    def write(self, path: str, data: str | bytes, mode: int | None = None) -> str:
+        """Add data as an archive member, returns "archive:member"."""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self._archive is None:
+            self._open()
+
+        name = self.member_name(path)
+        if name in self.members:
+            raise ValueError(f"Duplicate archive member: {name}")
+        self.members.add(name)
+        mode = self.mode if mode is None else mode
+
+        if self.kind == 'zip':
+            import time
+            import zipfile
+            info = zipfile.ZipInfo(name, time.gmtime(self.mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 3  # Unix, so external_attr carries the mode
+            info.external_attr = (0o100000 | mode) << 16
+            self._archive.writestr(info, data)
+        else:
+            import io
+            import tarfile
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = self.mtime
+            info.mode = mode
+            info.uid = info.gid = 0
+            info.uname = info.gname = 'root'
+            self._archive.addfile(info, io.BytesIO(data))
+
+        return f"{self.archive_path}:{name}"
+
+    def link(self, existing: str, path: str) -> str:
+        """Archives store every member in full; callers fall back to write()."""
+        raise OSError("Archive members cannot be hardlinked")
+
+    def commit(self) -> int:
+        """Finish the archive and move it into place, returns member count."""
+        if self._archive is None:
+            self._open()  # An empty run still produces a valid archive
+        try:
+            self._archive.close()
+            if self._gzip is not None:
+                self._gzip.close()
+            self._raw.flush()
+            if self.sync != 'none':
+                os.fsync(self._raw.fileno())
+            self._raw.close()
+            os.replace(self.tmp_path, self.archive_path)
+        except BaseException:
+            self.abort()
+            raise
+        if self.sync != 'none' and os.name == 'posix':
+            fd = os.open(os.path.dirname(self.archive_path) or '.', os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return len(self.members)
+
+    def abort(self) -> None:
+        """Discard the partial archive."""
+        for handle in (self._archive, self._gzip, self._raw):
+            if handle is not None:
+                try:
+                    handle.close()
+                except Exception:
+                    pass
+        if self.tmp_path is None:
+            return
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Batch Pipeline
+Staged reader -> transform -> writer pipeline for batch runs. Reader threads
+prefetch inputs, workers transform them (in a process pool for large
+batches) and writer threads store the results, so disk and CPU work overlap.
+
+Memory is capped by a byte budget: a file is admitted when it is read and
+released when its output has been written, so everything in flight (queued
+inputs, outputs waiting for a writer) stays under the budget even when a
+batch mixes many small files with a few huge ones.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Below this many files a process pool costs more than it saves
+PROCESS_THRESHOLD = 32
+
+# Each admitted file holds its input and, later, its output (base64 is 4/3
+# of the input, decoding 3/4), so charge twice the input size
+COST_FACTOR = 2
+
+
+class ByteBudget:
+    """Byte-counting semaphore. A request larger than the whole budget is
+    admitted alone, once nothing else is in flight."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.used = 0
+        self.cond = threading.Condition()
+
+    def acquire(self, nbytes: int) -> None:
+        with self.cond:
+            while self.used and self.used + nbytes > self.capacity:
+                self.cond.wait()
+            self.used += nbytes
+
+    def release(self, nbytes: int) -> None:
+        with self.cond:
+            self.used -= nbytes
+            self.cond.notify_all()
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> bytes:
+    """Content hash of a file, read in chunks."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return digest.digest()
+            digest.update(chunk)
+
+
+def find_duplicates(paths: list[str], digest=file_digest) -> tuple[list[str], dict[str, list[str]], int]:
+    """Group byte-identical files so each distinct content is processed once.
+
+    Only files sharing their size with another file are hashed, with
+    ``digest(path)`` (which may hash more than the file itself). Returns
+    (unique paths in input order, {first path: [identical paths]},
+    total bytes of the duplicates).
+    """
+    sizes = {}
+    by_size = {}
+    for path in paths:
+        try:
+            sizes[path] = os.stat(path).st_size
+        except OSError:
+            continue
+        by_size.setdefault(sizes[path], []).append(path)
+
+    original_of = {}
+    for group in by_size.values():
+        if len(group) < 2:
+            continue
+        seen = {}
+        for path in group:
+            try:
+                key = digest(path)
+            except OSError:
+                continue
+            if key in seen:
+                original_of[path] = seen[key]
+            else:
+                seen[key] = path
+
+    duplicates = {}
+    for path in paths:
+        if path in original_of:
+            duplicates.setdefault(original_of[path], []).append(path)
+
+    unique = [path for path in paths if path not in original_of]
+    return unique, duplicates, sum(sizes[path] for path in original_of)
+
+
+def run_pipeline(paths: list[str], read, transform, write, *, readers: int = 1,
+                 workers: int | None = None, writers: int = 1,
+                 max_bytes: int = DEFAULT_MAX_BYTES, ordered: bool = False,
+                 on_done=None) -> list[tuple]:
+    """Run read(path) -> transform(data) -> write(path, result) over paths.
+
+    ``transform`` must be a picklable module-level function when the batch
+    is large enough for the process pool. One reader and one writer thread
+    keep a local disk busy; raise them for high-latency (network) storage.
+    With ``ordered`` the single writer stores results in input order (needed
+    for reproducible archives). ``on_done(path, output, error)`` is called
+    once per file, serialized; an exception it raises is re-raised once the
+    pipeline has drained.
+
+    Returns [(path, output, error)] in input order.
+    """
+    import queue
+
+    workers = workers or os.cpu_count() or 1
+    if ordered:
+        writers = 1
+
+    budget = ByteBudget(max_bytes)
+    results = [None] * len(paths)
+    costs = [0] * len(paths)
+    next_index = iter(range(len(paths)))
+    admit_lock = threading.Lock()
+    done_lock = threading.Lock()
+    read_q = queue.Queue()
+    write_q = queue.Queue()
+    callback_errors = []
+
+    def finish(index, output, error):
+        results[index] = (paths[index], output, error)
+        try:
+            if on_done:
+                with done_lock:
+                    on_done(paths[index], output, error)
+        except Exception as e:
+            callback_errors.append(e)
+        finally:
+            budget.release(costs[index])
+
+    def reader():
+        while True:
+            # Admit files in input order so the oldest file in flight can
+            # always complete, which keeps ordered writes deadlock-free
+            with admit_lock:
+                index = next(next_index, None)
+                if index is None:
+                    return
+                try:
+                    costs[index] = os.stat(paths[index]).st_size * COST_FACTOR
+                except OSError:
+                    costs[index] = 0
+                budget.acquire(costs[index])
+            try:
+                read_q.put((index, read(paths[index])))
+            except Exception as e:
+                read_q.put((index, e))
+
+    executor = None
+    if workers > 1 and len(paths) >= PROCESS_THRESHOLD:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # Pool processes start on first use, when the pipeline threads are
+        # already running; forking then could copy a lock held by one of
+        # them, so start them from a clean forkserver process instead
+        context = None
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+    def worker():
+        while True:
+            item = read_q.get()
+            if item is None:
+                return
+            index, data = item
+            if isinstance(data, Exception):
+                write_q.put((index, data))
+                continue
+            try:
+                if executor:
+                    result = executor.submit(transform, data).result()
+                else:
+                    result = transform(data)
+            except Exception as e:
+                result = e
+            data = None
+            write_q.put((index, result))
+
+    def writer():
+        pending = {}
+        expected = 0
+        while True:
+            item = write_q.get()
+            if item is None:
+                return
+            if ordered:
+                pending[item[0]] = item[1]
+                ready = []
+                while expected in pending:
+                    ready.append((expected, pending.pop(expected)))
+                    expected += 1
+            else:
+                ready = [item]
+            for index, result in ready:
+                if isinstance(result, Exception):
+                    finish(index, None, result)
+                    continue
+                try:
+                    output = write(paths[index], result)
+                except Exception as e:
+                    finish(index, None, e)
+                else:
+                    finish(index, output, None)
+
+    def start(target, count):
+        threads = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    try:
+        reader_threads = start(reader, max(1, readers))
+        # Thread workers only overlap CPU with I/O; the process pool, when
+        # used, is what spreads encoding across cores
+        worker_threads = start(worker, workers if executor else 1)
+        writer_threads = start(writer, max(1, writers))
+
+        for thread in reader_threads:
+            thread.join()
+        for _ in worker_threads:
+            read_q.put(None)
+        for thread in worker_threads:
+            thread.join()
+        for _ in writer_threads:
+            write_q.put(None)
+        for thread in writer_threads:
+            thread.join()
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if callback_errors:
+        raise callback_errors[0]
+    return results
+
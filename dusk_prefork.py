@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Pre-fork Supervisor
+Runs N copies of a server in forked worker processes. Every worker binds the
+same port with SO_REUSEPORT and the kernel spreads new connections across
+them, so GIL-bound request handling scales with the number of cores.
+
+The supervisor restarts workers that die. On SIGTERM or Ctrl-C it asks each
+worker to stop accepting and finish its in-flight requests, waits for them
+up to a deadline and kills whatever is left.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import signal
+import socket
+import threading
+
+DRAIN_TIMEOUT = 30.0
+
+# A worker that dies sooner than this after starting is restarted only after
+# the same delay, so a crash loop cannot spin the supervisor
+RESTART_BACKOFF = 1.0
+
+
+def supported() -> bool:
+    """Pre-fork mode needs fork() and SO_REUSEPORT (Linux, BSD, macOS)."""
+    return hasattr(os, 'fork') and hasattr(socket, 'SO_REUSEPORT')
+
+
+def serve_worker(make_server, drain_timeout: float = DRAIN_TIMEOUT) -> int:
+    """Worker body: serve until SIGTERM, then finish in-flight requests.
+
+    Servers with a ``drain(timeout)`` method drain through it; otherwise
+    server_close() joins the request threads.
+    """
+    server = make_server()
+    drain = getattr(server, 'drain', None)
+    if drain is None:
+        # Track request threads so server_close() waits for them
+        server.daemon_threads = False
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever() returns, so not from here
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    # Ctrl-C reaches the whole process group; the supervisor coordinates
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+        if drain is not None and not drain(drain_timeout):
+            return 1
+    finally:
+        server.server_close()
+    return 0
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def run_prefork(make_server, processes: int, drain_timeout: float = DRAIN_TIMEOUT) -> int:
+    """Supervise ``processes`` workers each serving ``make_server()``.
+
+    ``make_server`` must bind with SO_REUSEPORT. It is called once in the
+    supervisor first, so bind errors are reported before anything forks.
+    Returns 0 after a clean drain, 1 if workers had to be killed.
+    """
+    make_server().server_close()
+
+    workers = {}
+
+    def spawn():
+        # Unflushed output would be written again by the child
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = serve_worker(make_server, drain_timeout)
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        workers[pid] = time.monotonic()
+
+    previous = signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        for _ in range(processes):
+            spawn()
+        while True:
+            pid, status = os.wait()
+            started = workers.pop(pid, None)
+            if started is None:
+                continue
+            print(f"✗ Worker {pid} berhenti (exit {_exit_code(status)}), dijalankan ulang",
+                  file=sys.stderr)
+            if time.monotonic() - started < RESTART_BACKOFF:
+                time.sleep(RESTART_BACKOFF)
+            spawn()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+    return _drain(workers, drain_timeout)
+
+
+def _drain(workers: dict, drain_timeout: float) -> int:
+    """Stop all workers gracefully, killing those still busy at the deadline."""
+    for pid in workers:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    deadline = time.monotonic() + drain_timeout
+    try:
+        while workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                workers.clear()
+                break
+            if pid:
+                workers.pop(pid, None)
+            else:
+                time.sleep(0.05)
+    except KeyboardInterrupt:
+        pass  # A second Ctrl-C skips the rest of the drain
+
+    killed = len(workers)
+    for pid in list(workers):
+        try:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+    if killed:
+        print(f"✗ {killed} worker dihentikan paksa setelah {drain_timeout:g} detik", file=sys.stderr)
+    return 1 if killed else 0
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Usage Statistics Store
+Append-only event log with periodic compaction into a JSON snapshot.
+
+Each operation appends one line to ``.dusk_stats.jsonl`` with a single
+O_APPEND write, so parallel sessions never lose counts. When the log grows
+past a threshold it is folded into ``.dusk_stats.json`` (written atomically)
+and truncated. The snapshot records how much of which log it folded in, so
+a crash before the truncation does not count those events twice.
+"""
+
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, compaction disabled
+    fcntl = None
+
+LOG_FILE = '.dusk_stats.jsonl'
+SNAPSHOT_FILE = '.dusk_stats.json'
+COMPACT_THRESHOLD = 256 * 1024
+
+
+class UsageStats:
+    """Concurrency-safe usage statistics with per-operation metrics"""
+
+    def __init__(self, directory: str = '.', compact_threshold: int = COMPACT_THRESHOLD):
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.compact_threshold = compact_threshold
+
+    def record(self, operation: str, bytes_processed: int = 0, file_count: int = 0,
+               duration: float = 0.0) -> None:
+        """Append one operation event to the log"""
+        line = (f'{{"t": {time.time():.3f}, "op": "{operation}", "bytes": {int(bytes_processed)}, '
+                f'"files": {int(file_count)}, "dur": {duration:.6f}}}\n').encode('ascii')
+
+        try:
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError:
+            return  # Read-only directory: statistics are best effort
+
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+            os.write(fd, line)
+            size = os.fstat(fd).st_size
+        except OSError:
+            return  # Disk full or I/O error: never fail the operation itself
+        finally:
+            os.close(fd)
+
+        if size > self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> bool:
+        """Fold the event log into the snapshot. Returns False if skipped."""
+        if not fcntl:
+            return False
+
+        try:
+            fd = os.open(self.log_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return False
+
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False  # Another process is compacting
+
+            summary, folded = self._load_snapshot()
+            raw = self._read_fd(fd)
+            self._apply_events(summary, self._unfolded(raw, folded))
+            self._write_snapshot(summary, {'offset': len(raw), 'head': self._first_line(raw)})
+            os.ftruncate(fd, 0)
+            return True
+        except OSError:
+            return False  # Disk full: the events stay in the log for next time
+        finally:
+            os.close(fd)
+
+    def summary(self) -> dict:
+        """Return aggregated statistics from snapshot plus pending log events"""
+        try:
+            fd = os.open(self.log_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return self._load_snapshot()[0]
+
+        # Hold the shared lock across both reads so a concurrent compaction
+        # cannot move events from the log into the snapshot in between
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+            summary, folded = self._load_snapshot()
+            self._apply_events(summary, self._unfolded(self._read_fd(fd), folded))
+        finally:
+            os.close(fd)
+        return summary
+
+    def throughput_by_day(self, days: int = 7) -> list:
+        """Return [(day, operation, files, bytes, duration)] for the latest days"""
+        daily = self.summary()['daily']
+        rows = []
+        for day in sorted(daily)[-days:]:
+            for operation, (count, files, nbytes, duration) in sorted(daily[day].items()):
+                rows.append((day, operation, files, nbytes, duration))
+        return rows
+
+    def _read_fd(self, fd: int) -> bytes:
+        chunks = []
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def _first_line(self, raw: bytes) -> str:
+        return raw.split(b'\n', 1)[0].decode('ascii', 'replace')
+
+    def _unfolded(self, raw: bytes, folded) -> bytes:
+        """Log events not yet in the snapshot.
+
+        ``folded`` is the snapshot's record of the log it compacted: its
+        length and first line. The first line changes once that log is
+        truncated and refilled; while it still matches, the compaction
+        crashed before truncating and the folded prefix is skipped.
+        """
+        if folded and len(raw) >= folded['offset'] and self._first_line(raw) == folded['head']:
+            return raw[folded['offset']:]
+        return raw
+
+    def _load_snapshot(self) -> tuple:
+        """Return (summary, folded) from the snapshot file"""
+        import json
+
+        summary = {'total_runs': 0, 'last_run': None, 'operations': {}, 'daily': {}}
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return summary, None
+        except (OSError, ValueError):
+            return summary, None  # Corrupt snapshot is rebuilt from new events
+
+        # Snapshots written before the event log only had total_runs/last_run
+        summary['total_runs'] = data.get('total_runs', 0)
+        summary['last_run'] = data.get('last_run')
+        summary['operations'] = data.get('operations', {})
+        summary['daily'] = data.get('daily', {})
+        return summary, data.get('folded')
+
+    def _apply_events(self, summary: dict, raw: bytes) -> None:
+        import json
+        from datetime import datetime
+
+        for line in raw.splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # Torn line from a crashed writer
+
+            operation = event.get('op', 'unknown')
+            timestamp = datetime.fromtimestamp(event.get('t', 0))
+            if operation == 'run':
+                summary['total_runs'] += 1
+                summary['last_run'] = timestamp.isoformat(timespec='seconds')
+
+            metrics = [1, event.get('files', 0), event.get('bytes', 0), event.get('dur', 0.0)]
+            totals = summary['operations'].setdefault(operation, [0, 0, 0, 0.0])
+            day = summary['daily'].setdefault(timestamp.strftime('%Y-%m-%d'), {})
+            day_totals = day.setdefault(operation, [0, 0, 0, 0.0])
+            for i, value in enumerate(metrics):
+                totals[i] += value
+                day_totals[i] += value
+
+    def _write_snapshot(self, summary: dict, folded: dict) -> None:
+        import json
+
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(summary, folded=folded), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+DUSK CIPHER Worker Pool
+Persistent worker processes for CPU-heavy request work (compile validation,
+base64, UTF-8 decoding), so a server's accept and parse threads stay
+responsive and one pathological input cannot stall the whole process.
+
+Each worker owns a pipe and runs one job at a time. A job that overruns its
+timeout gets its worker killed and replaced (in the background, so the
+request that timed out does not also wait for a process to start), unlike a
+ProcessPoolExecutor, where a stuck task can only be abandoned, never stopped.
+"""
+
+from __future__ import annotations
+
+import queue
+import signal
+import threading
+
+DEFAULT_JOB_TIMEOUT = 10.0
+
+
+class JobTimeout(Exception):
+    """A job ran past its timeout; its worker was killed and replaced."""
+
+
+class WorkerCrashed(Exception):
+    """A worker died while running a job."""
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: run (func, args) jobs until the pipe closes."""
+    # Ctrl-C is handled by the parent, which kills workers on close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            func, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = ('ok', func(*args))
+        except Exception as e:
+            reply = ('error', e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # The result or exception did not pickle
+            conn.send(('error', RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """Fixed-size pool of worker processes with per-job timeouts.
+
+    Workers are started on first use, so a pool can be created before the
+    process forks (pre-fork servers) without leaking children. ``func``
+    must be a picklable module-level function.
+    """
+
+    def __init__(self, size: int, timeout: float = DEFAULT_JOB_TIMEOUT, start_method: str = 'spawn'):
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1: {size}")
+        self.size = size
+        self.timeout = timeout
+        self.start_method = start_method
+        self.idle = queue.Queue()
+        self.workers = set()
+        self.replaced = 0
+        self._context = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._context is not None:
+                return
+            if self._closed:
+                raise RuntimeError("Worker pool is closed")
+            import multiprocessing
+            self._context = multiprocessing.get_context(self.start_method)
+            for _ in range(self.size):
+                self.idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context)
+        self.workers.add(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> None:
+        with self._lock:
+            self.workers.discard(worker)
+            self.replaced += 1
+        threading.Thread(target=self._respawn, args=(worker,), name='worker-respawn',
+                         daemon=True).start()
+
+    def _respawn(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            if self._closed:
+                return
+            successor = self._spawn()
+        self.idle.put(successor)
+
+    def run(self, func, *args, timeout: float | None = None):
+        """Run func(*args) in a worker and return its result.
+
+        Waits for an idle worker first. Exceptions raised by the job are
+        re-raised here; raises JobTimeout or WorkerCrashed when the worker
+        had to be replaced, and RuntimeError once the pool is closed.
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        if self._context is None:
+            self._start()
+        timeout = self.timeout if timeout is None else timeout
+
+        worker = self.idle.get()
+        if self._closed:
+            self.idle.put(worker)  # Wake the next waiter as well
+            raise RuntimeError("Worker pool is closed")
+
+        replaced = False
+        try:
+            try:
+                worker.conn.send((func, args))
+                if not worker.conn.poll(timeout):
+                    replaced = True
+                    self._replace(worker)
+                    raise JobTimeout(f"Job exceeded {timeout:g}s, worker replaced")
+                status, value = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                replaced = True
+                self._replace(worker)
+                raise WorkerCrashed(f"Worker died during job: {e}")
+        finally:
+            if not replaced:
+                self.idle.put(worker)
+
+        if status == 'error':
+            raise value
+        return value
+
+    def close(self) -> None:
+        """Stop all workers; jobs still running are cut off."""
+        with self._lock:
+            self._closed = True
+            workers, self.workers = self.workers, set()
+        for worker in workers:
+            worker.kill()
+        # Callers waiting for an idle worker see the pool is closed
+        self.idle.put(None)
@@ -4,13 +4,21 @@ Python Script Decoder Tool
 A command-line tool for decoding obfuscated Python scripts that were encoded using base64.
 """
 
-import os
+from __future__ import annotations
+
 import sys
 import base64
-import argparse
 import pathlib
 import re
-from typing import List, Optional
+
+from dusk_classifier import (classify_file, classify_header, HEADER_SIZE, PLAIN, UNKNOWN, WRAPPER,
+                             SIDECAR_FORMAT, SIDECAR_SUFFIX)
+
+# Bytes read per step in stream mode
+STREAM_CHUNK = 64 * 1024
+
+# Opening of the payload string in the standard triple-quoted wrapper
+_TRIPLE_OPEN = re.compile(rb'\w+\s*=\s*[bB]?"""')
 
 
 class PyDecoder:
@@ -19,6 +27,9 @@ class PyDecoder:
     def __init__(self):
         self.supported_extensions = ['.py', '.pyw']
         self.decoded_suffix = '_decoded'
+        self.layer_chains = {}
+        from dusk_output import AtomicWriter
+        self.writer = AtomicWriter()
     
     def is_python_file(self, file_path: pathlib.Path) -> bool:
         """Check if the file is a Python script."""
@@ -37,21 +48,33 @@ class PyDecoder:
         except UnicodeDecodeError:
             raise ValueError(f"Cannot decode file (not UTF-8): {file_path}")
     
-    def decode_obfuscated_script(self, obfuscated_code: str) -> str:
-        """Decode an obfuscated Python script back to original."""
+    def extract_payload(self, obfuscated_code: str, wrapper_format: str | None = None) -> str:
+        """Extract the base64 payload from an obfuscated script.
+
+        ``wrapper_format`` comes from dusk_classifier; for the standard
+        triple-quoted base64 wrapper the payload is sliced out directly
+        instead of running the regex cascade over the whole file.
+        """
         base64_content = None
         
-        # Try to extract the base64 content from the obfuscated script
-        # Look for any variable name followed by base64 content in triple quotes
-        pattern = r'(\w+)\s*=\s*"""([^"]+)"""'
-        match = re.search(pattern, obfuscated_code, re.DOTALL)
+        if wrapper_format == 'base64:triple':
+            start = obfuscated_code.find('"""')
+            end = obfuscated_code.find('"""', start + 3)
+            if start != -1 and end != -1:
+                base64_content = obfuscated_code[start + 3:end].strip()
         
-        if match:
-            var_name = match.group(1)
-            content = match.group(2).strip()
-            # Check if this variable is used in base64.b64decode
-            if var_name in obfuscated_code and 'base64.b64decode' in obfuscated_code:
-                base64_content = content
+        if not base64_content:
+            # Try to extract the base64 content from the obfuscated script
+            # Look for any variable name followed by base64 content in triple quotes
+            pattern = r'(\w+)\s*=\s*"""([^"]+)"""'
+            match = re.search(pattern, obfuscated_code, re.DOTALL)
+            
+            if match:
+                var_name = match.group(1)
+                content = match.group(2).strip()
+                # Check if this variable is used in base64.b64decode
+                if var_name in obfuscated_code and 'base64.b64decode' in obfuscated_code:
+                    base64_content = content
         
         if not base64_content:
             # Try alternative pattern with single quotes
@@ -85,13 +108,271 @@ class PyDecoder:
         if not base64_content:
             raise ValueError("Cannot find valid base64 content in the script. Make sure this is an obfuscated Python script.")
         
+        return base64_content
+    
+    def decode_obfuscated_script(self, obfuscated_code: str, wrapper_format: str | None = None) -> str:
+        """Decode an obfuscated Python script back to original (one layer)."""
+        return self.decode_layer(obfuscated_code, wrapper_format)[0]
+    
+    def decode_layer(self, obfuscated_code: str, wrapper_format: str | None = None,
+                     max_size: int | None = None) -> tuple[str, str]:
+        """Decode one wrapper layer, returns (source, layer name)."""
+        base64_content = self.extract_payload(obfuscated_code, wrapper_format)
+        
         try:
-            # Decode the base64 content
-            decoded_bytes = base64.b64decode(base64_content)
+            decoded_bytes, codecs = self.decode_payload(base64_content, max_size)
             original_script = decoded_bytes.decode('utf-8')
-            return original_script
         except Exception as e:
             raise ValueError(f"Failed to decode base64 content: {str(e)}")
+        return original_script, self.layer_name(codecs, wrapper_format)
+    
+    def layer_name(self, codecs: list[str], wrapper_format: str | None) -> str:
+        """Chain entry for a decoded layer, e.g. ``base64+zlib:triple``."""
+        storage = wrapper_format.split(':')[-1] if wrapper_format else 'unknown'
+        return f"{'+'.join(codecs)}:{storage}"
+    
+    def decode_payload(self, base64_content: str, max_size: int | None = None) -> tuple[bytes, list[str]]:
+        """Decode a base64 payload, decompressing it if it is compressed.
+        
+        The payload is decoded in chunks that are fed straight into the
+        decompressor, so the intermediate compressed bytes are never held
+        whole. Returns (decoded bytes, codecs applied).
+        """
+        if re.search(r'\s', base64_content):
+            base64_content = ''.join(base64_content.split())
+        
+        # base64 expands 4:3, so the decoded size is known before decoding
+        if max_size is not None and len(base64_content) * 3 // 4 > max_size:
+            raise ValueError(f"Decoded layer would exceed size limit ({max_size} bytes)")
+        
+        codecs = ['base64']
+        chunk_size = 4 * 65536
+        chunks = (base64_content[offset:offset + chunk_size]
+                  for offset in range(0, len(base64_content), chunk_size))
+        return b''.join(self.iter_decoded(chunks, max_size, codecs)), codecs
+    
+    def iter_decoded(self, chunks, max_size: int | None = None, codecs: list[str] | None = None):
+        """Incrementally decode base64 chunks, decompressing if needed.
+        
+        Chunks may be split anywhere and contain whitespace; only one chunk
+        plus a few carried characters is held at a time. Codecs detected
+        past base64 are appended to ``codecs``. Yields decoded bytes.
+        """
+        import binascii
+        
+        def blocks():
+            carry = b''
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('ascii')
+                data = carry + chunk.translate(None, b' \t\r\n\f\v')
+                cut = len(data) - len(data) % 4
+                carry = data[cut:]
+                if cut:
+                    yield binascii.a2b_base64(data[:cut])
+            if carry:
+                yield binascii.a2b_base64(carry)
+        
+        decompressor = None
+        pending = b''
+        sniffed = False
+        output_size = 0
+        
+        def emit(chunk):
+            nonlocal output_size
+            if decompressor is not None:
+                # Bound each step so a compression bomb cannot exceed max_size
+                if max_size is not None:
+                    chunk = decompressor.decompress(chunk, max_size - output_size + 1)
+                else:
+                    chunk = decompressor.decompress(chunk)
+            output_size += len(chunk)
+            if max_size is not None and output_size > max_size:
+                raise ValueError(f"Decoded layer exceeds size limit ({max_size} bytes)")
+            return chunk
+        
+        def start(block, final):
+            # Pick the decompressor from the first block's magic bytes; the
+            # codec is recorded only once the block really decompresses
+            nonlocal decompressor, output_size
+            decompressor, codec = self._sniff_decompressor(block)
+            if decompressor is None:
+                return emit(block)
+            try:
+                chunk = emit(block)
+                # A whole payload must also be a whole compressed stream
+                compressed = decompressor.eof or not final
+            except ValueError:
+                raise  # Size limit
+            except Exception:
+                compressed = False
+            if not compressed:
+                # Magic bytes by coincidence: the payload is not compressed
+                decompressor = None
+                output_size = 0
+                return emit(block)
+            if codecs is not None:
+                codecs.append(codec)
+            return chunk
+        
+        for block in blocks():
+            if not sniffed:
+                # Magic bytes may straddle the first tiny blocks
+                pending += block
+                if len(pending) < 6:
+                    continue
+                block, pending, sniffed = pending, b'', True
+                yield start(block, final=False)
+                continue
+            yield emit(block)
+        
+        if pending:
+            # The whole payload is shorter than the magic bytes window
+            yield start(pending, final=True)
+        
+        if decompressor is not None and not decompressor.eof:
+            raise ValueError(f"Truncated {codecs[-1] if codecs else 'compressed'} stream in payload")
+    
+    def _sniff_decompressor(self, head: bytes):
+        """Pick a streaming decompressor from the magic bytes of a payload."""
+        # zlib: CM=8, header checksum, no preset dictionary (rules out
+        # plain text such as "x = 1" whose first bytes pass the checksum)
+        if (head[:1] == b'\x78' and len(head) > 1 and (head[0] * 256 + head[1]) % 31 == 0
+                and not head[1] & 0x20):
+            import zlib
+            return zlib.decompressobj(), 'zlib'
+        if head[:3] == b'BZh':
+            import bz2
+            return bz2.BZ2Decompressor(), 'bz2'
+        if head[:6] == b'\xfd7zXZ\x00':
+            import lzma
+            return lzma.LZMADecompressor(), 'lzma'
+        return None, None
+    
+    def unwrap_layers(self, obfuscated_code: str, max_layers: int = 1,
+                      max_size: int | None = None) -> tuple[str, list[str]]:
+        """Peel wrapper layers until plain source or max_layers is reached.
+        
+        Only the current layer is kept alive: the wrapper text is released
+        as soon as its payload is extracted. Returns (source, layer chain).
+        """
+        chain = []
+        current = obfuscated_code
+        obfuscated_code = None
+        
+        while True:
+            head = current[:HEADER_SIZE].encode('utf-8', 'replace')
+            remaining = max(len(current) - HEADER_SIZE, 0)
+            kind, wrapper_format = classify_header(head, len(head) + remaining)
+            if kind == PLAIN or (kind == UNKNOWN and chain):
+                break
+            if len(chain) >= max_layers:
+                if chain:
+                    break
+                raise ValueError("Layer limit must be at least 1")
+            
+            payload = self.extract_payload(current, wrapper_format)
+            current = None
+            decoded, codecs = self.decode_payload(payload, max_size)
+            payload = None
+            try:
+                current = decoded.decode('utf-8')
+            except UnicodeDecodeError:
+                raise ValueError(f"Layer {len(chain) + 1} did not decode to UTF-8 text")
+            decoded = None
+            chain.append(self.layer_name(codecs, wrapper_format))
+        
+        if not chain:
+            raise ValueError("Script is not obfuscated")
+        
+        return current, chain
+    
+    def decode_stream(self, source, sink, max_layers: int = 1, max_size: int | None = None,
+                      chunk_size: int = STREAM_CHUNK) -> list[str]:
+        """Decode a wrapper read from a binary stream onto another stream.
+        
+        Triple-quoted wrappers (base64, optionally compressed) are decoded
+        as they are read, holding one chunk at a time. Other wrapper styles, and nested layers found
+        under the first one, are read whole up to ``max_size``. Returns the
+        layer chain.
+        """
+        read = getattr(source, 'read1', source.read)
+        head = b''
+        while len(head) < HEADER_SIZE:
+            chunk = read(HEADER_SIZE - len(head))
+            if not chunk:
+                break
+            head += chunk
+        complete = len(head) < HEADER_SIZE
+        
+        kind, wrapper_format = classify_header(head, len(head) if complete else len(head) + 1)
+        if kind == PLAIN:
+            raise ValueError("Input is not an obfuscated script")
+        
+        triple = wrapper_format is not None and wrapper_format.endswith(':triple')
+        match = _TRIPLE_OPEN.search(head) if triple else None
+        if not match:
+            code = (head + self._read_bounded(source, max_size, chunk_size)).decode('utf-8')
+            decoded, chain = self.unwrap_layers(code, max_layers, max_size)
+            sink.write(decoded.encode('utf-8'))
+            sink.flush()
+            return chain
+        
+        def payload_chunks():
+            data = head[match.end():]
+            while True:
+                end = data.find(b'"')
+                if end != -1:
+                    yield data[:end]
+                    return
+                if data:
+                    yield data
+                data = read(chunk_size)
+                if not data:
+                    raise ValueError("Unterminated payload string in input")
+        
+        codecs = ['base64']
+        blocks = self.iter_decoded(payload_chunks(), max_size, codecs)
+        
+        # Look at the start of the decoded layer to see if it is plain source
+        peek = b''
+        exhausted = True
+        if max_layers > 1:
+            for block in blocks:
+                peek += block
+                if len(peek) >= HEADER_SIZE:
+                    exhausted = False
+                    break
+            inner_kind, _ = classify_header(peek[:HEADER_SIZE], len(peek) + (0 if exhausted else 1))
+            if inner_kind == WRAPPER:
+                decoded = (peek + b''.join(blocks)).decode('utf-8')
+                peek = None
+                decoded, inner = self.unwrap_layers(decoded, max_layers - 1, max_size)
+                sink.write(decoded.encode('utf-8'))
+                sink.flush()
+                return [self.layer_name(codecs, wrapper_format)] + inner
+        
+        if peek:
+            sink.write(peek)
+        for block in blocks:
+            sink.write(block)
+        sink.flush()
+        return [self.layer_name(codecs, wrapper_format)]
+    
+    def _read_bounded(self, source, max_size: int | None, chunk_size: int = STREAM_CHUNK) -> bytes:
+        """Read the rest of a stream, refusing input beyond what max_size allows."""
+        # A wrapper is its base64 payload (4/3 of the decoded size) plus a prologue
+        limit = max_size * 4 // 3 + HEADER_SIZE if max_size is not None else None
+        chunks = []
+        size = 0
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return b''.join(chunks)
+            size += len(chunk)
+            if limit is not None and size > limit:
+                raise ValueError(f"Input exceeds size limit ({max_size} bytes decoded)")
+            chunks.append(chunk)
     
     def is_base64(self, s: str) -> bool:
         """Check if string is valid base64."""
@@ -106,7 +387,7 @@ class PyDecoder:
         except:
             return False
     
-    def generate_output_path(self, input_path: pathlib.Path, output_dir: Optional[str] = None) -> pathlib.Path:
+    def generate_output_path(self, input_path: pathlib.Path, output_dir: str | None = None) -> pathlib.Path:
         """Generate output file path for decoded script."""
         if output_dir:
             output_directory = pathlib.Path(output_dir)
@@ -118,26 +399,44 @@ class PyDecoder:
             filename = input_path.stem + self.decoded_suffix + input_path.suffix
             return input_path.parent / filename
     
-    def write_decoded_script(self, decoded_content: str, output_path: pathlib.Path) -> None:
-        """Write decoded script to file."""
+    def write_decoded_script(self, decoded_content: str, output_path: pathlib.Path) -> str:
+        """Write decoded script through the output writer, returns where it went."""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(decoded_content)
-            
-            # Make the file executable on Unix-like systems
-            if os.name == 'posix':
-                os.chmod(output_path, 0o755)
-                
+            # Temp file + rename; created executable, no separate chmod
+            return self.writer.write(output_path, decoded_content, mode=0o755)
         except PermissionError:
             raise PermissionError(f"Permission denied writing to: {output_path}")
         except Exception as e:
             raise Exception(f"Failed to write decoded script: {e}")
     
-    def decode_single_file(self, input_file: str, output_dir: Optional[str] = None) -> str:
-        """Decode a single obfuscated Python file."""
+    def decode_single_file(self, input_file: str, output_dir: str | None = None,
+                           max_layers: int = 1, max_size: int | None = None) -> str:
+        """Decode a single obfuscated Python file.
+        
+        Peels up to ``max_layers`` wrapper layers; the layer chain found is
+        recorded in ``self.layer_chains[input_file]``.
+        """
+        input_path, wrapper_format = self.validate_input(input_file)
+        
+        # Read and decode the script
+        if wrapper_format == SIDECAR_FORMAT:
+            decoded_content, chain = self.decode_sidecar(self.read_sidecar(input_path), input_file,
+                                                         max_layers, max_size)
+        else:
+            decoded_content, chain = self.decode_content(self.read_script(input_path), input_file,
+                                                         wrapper_format, max_layers, max_size)
+        self.layer_chains[input_file] = chain
+        
+        # Generate output path
+        output_path = self.generate_output_path(input_path, output_dir)
+        
+        # Write decoded script
+        return self.write_decoded_script(decoded_content, output_path)
+    
+    def validate_input(self, input_file: str) -> tuple[pathlib.Path, str | None]:
+        """Check that an input is an obfuscated Python file, returns (path, wrapper format)."""
         input_path = pathlib.Path(input_file)
         
-        # Validate input file
         if not input_path.exists():
             raise FileNotFoundError(f"Input file does not exist: {input_file}")
         
@@ -147,38 +446,140 @@ class PyDecoder:
         if not self.is_python_file(input_path):
             raise ValueError(f"File is not a Python script: {input_file}")
         
-        # Read obfuscated script content
-        obfuscated_content = self.read_script(input_path)
+        # Reject plain scripts from the header alone, before a full read;
+        # anything the classifier is unsure of (unknown) is still decoded
+        kind, wrapper_format = classify_file(str(input_path))
+        if kind == PLAIN:
+            raise ValueError(f"Not an obfuscated script: {input_file}")
         
+        return input_path, wrapper_format
+    
+    def decode_content(self, obfuscated_content: str, input_file: str, wrapper_format: str | None,
+                       max_layers: int = 1, max_size: int | None = None) -> tuple[str, list[str]]:
+        """Decode wrapper source, returns (decoded source, layer chain)."""
         if not obfuscated_content.strip():
             raise ValueError(f"Script file is empty: {input_file}")
         
-        # Decode the script
-        decoded_content = self.decode_obfuscated_script(obfuscated_content)
+        if max_layers == 1:
+            decoded, layer = self.decode_layer(obfuscated_content, wrapper_format, max_size)
+            return decoded, [layer]
+        return self.unwrap_layers(obfuscated_content, max_layers, max_size)
+    
+    def read_sidecar(self, input_path: pathlib.Path) -> bytes:
+        """Read the payload file belonging to a sidecar stub."""
+        sidecar_path = input_path.with_suffix(SIDECAR_SUFFIX)
+        try:
+            with open(sidecar_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Sidecar payload not found: {sidecar_path}")
+    
+    def decode_sidecar(self, payload: bytes, input_file: str, max_layers: int = 1,
+                       max_size: int | None = None) -> tuple[str, list[str]]:
+        """Decompress a sidecar payload, then peel any wrapper layers inside it."""
+        import zlib
         
-        # Generate output path
-        output_path = self.generate_output_path(input_path, output_dir)
+        decompressor = zlib.decompressobj()
+        try:
+            if max_size is not None:
+                data = decompressor.decompress(payload, max_size + 1)
+            else:
+                data = decompressor.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt sidecar payload for {input_file}: {e}")
+        if max_size is not None and len(data) > max_size:
+            raise ValueError(f"Decoded layer exceeds size limit ({max_size} bytes)")
+        if not decompressor.eof:
+            raise ValueError(f"Truncated sidecar payload for {input_file}")
         
-        # Write decoded script
-        self.write_decoded_script(decoded_content, output_path)
+        try:
+            decoded_content = data.decode('utf-8')
+        except UnicodeDecodeError:
+            raise ValueError(f"Sidecar payload did not decode to UTF-8 text: {input_file}")
+        data = None
         
-        return str(output_path)
+        chain = [SIDECAR_FORMAT]
+        head = decoded_content[:HEADER_SIZE].encode('utf-8', 'replace')
+        if max_layers > 1 and classify_header(head, len(decoded_content))[0] == WRAPPER:
+            decoded_content, inner = self.unwrap_layers(decoded_content, max_layers - 1, max_size)
+            chain += inner
+        return decoded_content, chain
     
-    def decode_multiple_files(self, input_files: List[str], output_dir: Optional[str] = None) -> List[str]:
-        """Decode multiple obfuscated Python files."""
-        results = []
+    def sidecar_digest(self, input_file: str) -> bytes:
+        """Content key for deduplication: sidecar stubs are all identical, so
+        they are keyed by their payload file instead."""
+        from dusk_pipeline import file_digest
+        if classify_file(input_file)[1] == SIDECAR_FORMAT:
+            return b'sidecar:' + file_digest(str(pathlib.Path(input_file).with_suffix(SIDECAR_SUFFIX)))
+        return file_digest(input_file)
+    
+    def decode_multiple_files(self, input_files: list[str], output_dir: str | None = None,
+                              max_layers: int = 1, max_size: int | None = None,
+                              workers: int | None = None,
+                              max_bytes: int | None = None, dedup: bool = True) -> list[str]:
+        """Decode multiple obfuscated Python files.
+        
+        Reading, decoding and writing run as overlapping pipeline stages
+        whose in-flight data is capped at ``max_bytes`` (None for the
+        pipeline default). With ``dedup``, byte-identical inputs are decoded
+        once and their outputs hardlinked (or rewritten where links are not
+        possible).
+        """
+        import functools
+        from dusk_pipeline import run_pipeline, find_duplicates, DEFAULT_MAX_BYTES
+        
+        if max_bytes is None:
+            max_bytes = DEFAULT_MAX_BYTES
+        
         errors = []
+        results = []
         
-        for input_file in input_files:
-            try:
-                output_path = self.decode_single_file(input_file, output_dir)
-                results.append(output_path)
-                print(f"✓ Successfully decoded: {input_file} -> {output_path}")
-            except Exception as e:
-                error_msg = f"✗ Failed to decode {input_file}: {e}"
-                errors.append(error_msg)
-                print(error_msg, file=sys.stderr)
+        if dedup:
+            unique_files, duplicates, saved_bytes = find_duplicates(input_files, self.sidecar_digest)
+        else:
+            unique_files, duplicates, saved_bytes = input_files, {}, 0
+        fanned_out = {}
+        
+        def read(input_file):
+            input_path, wrapper_format = self.validate_input(input_file)
+            if wrapper_format == SIDECAR_FORMAT:
+                return input_file, self.read_sidecar(input_path), wrapper_format
+            with open(input_file, 'rb') as f:
+                return input_file, f.read(), wrapper_format
+        
+        def write(input_file, decoded):
+            decoded_content, self.layer_chains[input_file] = decoded
+            output_path = self.generate_output_path(pathlib.Path(input_file), output_dir)
+            output_path = self.write_decoded_script(decoded_content, output_path)
+            for duplicate in duplicates.get(input_file, ()):
+                self.layer_chains[duplicate] = self.layer_chains[input_file]
+                try:
+                    fanned_out[duplicate] = (self.copy_output(output_path, duplicate, output_dir,
+                                                              decoded_content), None)
+                except Exception as e:
+                    fanned_out[duplicate] = (None, e)
+            return output_path
+        
+        def report(input_file, output_path, error):
+            for path in [input_file] + duplicates.get(input_file, []):
+                if path != input_file:
+                    output_path, error = fanned_out.get(path, (None, error))
+                if error:
+                    error_msg = f"✗ Failed to decode {path}: {error}"
+                    errors.append(error_msg)
+                    print(error_msg, file=sys.stderr)
+                else:
+                    results.append(output_path)
+                    print(f"✓ Successfully decoded: {path} -> {output_path}{self.format_chain(path)}")
+        
+        transform = functools.partial(decode_file_data, max_layers=max_layers, max_size=max_size)
+        run_pipeline(unique_files, read, transform, write,
+                     workers=workers, max_bytes=max_bytes,
+                     ordered=self.writer.ordered, on_done=report)
         
+        if saved_bytes:
+            print(f"\nDeduplicated {len(input_files) - len(unique_files)} identical file(s), "
+                  f"skipped decoding {saved_bytes} bytes")
         if errors:
             print(f"\nCompleted with {len(errors)} error(s) out of {len(input_files)} file(s)")
         else:
@@ -186,7 +587,24 @@ class PyDecoder:
         
         return results
     
-    def find_python_files(self, directory: str, recursive: bool = False) -> List[str]:
+    def copy_output(self, existing_output: str, input_file: str, output_dir: str | None,
+                    decoded_content: str) -> str:
+        """Give a duplicate input the output already written for its twin."""
+        self.validate_input(input_file)
+        output_path = self.generate_output_path(pathlib.Path(input_file), output_dir)
+        try:
+            return self.writer.link(existing_output, output_path)
+        except OSError:
+            return self.write_decoded_script(decoded_content, output_path)
+    
+    def format_chain(self, input_file: str) -> str:
+        """Describe the layers peeled from a file, if more than one."""
+        chain = self.layer_chains.get(input_file, [])
+        if len(chain) < 2:
+            return ''
+        return f" [{len(chain)} layers: {' -> '.join(chain)}]"
+    
+    def find_python_files(self, directory: str, recursive: bool = False) -> list[str]:
         """Find Python files in a directory."""
         directory_path = pathlib.Path(directory)
         
@@ -205,11 +623,31 @@ class PyDecoder:
             for ext in self.supported_extensions:
                 python_files.extend(directory_path.glob(f'*{ext}'))
         
-        return [str(f) for f in python_files]
+        return sorted(str(f) for f in python_files)
+
+
+def decode_file_data(item: tuple[str, bytes, str | None], max_layers: int = 1,
+                     max_size: int | None = None) -> tuple[str, list[str]]:
+    """Pipeline stage: (path, raw bytes, wrapper format) -> (source, layer chain).
+    
+    Module-level so the batch pipeline can run it in a process pool.
+    """
+    input_file, data, wrapper_format = item
+    if wrapper_format == SIDECAR_FORMAT:
+        return PyDecoder().decode_sidecar(data, input_file, max_layers, max_size)
+    try:
+        obfuscated_content = data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError(f"Cannot decode file (not UTF-8): {input_file}")
+    return PyDecoder().decode_content(obfuscated_content, input_file, wrapper_format,
+                                      max_layers, max_size)
 
 
 def main():
     """Main function to handle command line arguments and execute decoding."""
+    import argparse
+    from dusk_output import AtomicWriter, ArchiveWriter, SYNC_POLICIES
+
     parser = argparse.ArgumentParser(
         description='Python Script Decoder - Decode obfuscated Python scripts',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -220,6 +658,10 @@ Examples:
   %(prog)s -d /path/to/scripts            # Decode all Python files in directory
   %(prog)s -d /path/to/scripts -r         # Decode recursively
   %(prog)s script.py -o /output/dir       # Specify output directory
+  %(prog)s --until-plain nested.py        # Peel all wrapper layers
+  %(prog)s --depth 3 nested.py            # Peel at most 3 layers
+  cat wrapped.py | %(prog)s - > plain.py  # Pipe mode: stdin to stdout
+  %(prog)s wrapped.py -o -                # Write the decoded script to stdout
         """
     )
     
@@ -227,7 +669,7 @@ Examples:
     parser.add_argument(
         'files',
         nargs='*',
-        help='Obfuscated Python files to decode'
+        help='Obfuscated Python files to decode ("-" reads stdin and writes stdout)'
     )
     
     parser.add_argument(
@@ -243,7 +685,67 @@ Examples:
     
     parser.add_argument(
         '-o', '--output',
-        help='Output directory for decoded files'
+        help='Output directory for decoded files ("-" writes a single file to stdout)'
+    )
+    
+    parser.add_argument(
+        '--depth',
+        type=int,
+        default=1,
+        help='Maximum number of wrapper layers to peel (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--until-plain',
+        action='store_true',
+        help='Peel layers until plain source is reached (bounded by --max-layers)'
+    )
+    
+    parser.add_argument(
+        '--max-layers',
+        type=int,
+        default=32,
+        help='Layer limit for --until-plain (default: 32)'
+    )
+    
+    parser.add_argument(
+        '--max-size',
+        type=int,
+        default=256,
+        help='Maximum decoded size per layer in MB (default: 256)'
+    )
+    
+    parser.add_argument(
+        '--archive',
+        metavar='FILE',
+        help='Write all outputs into one reproducible .tar, .tar.gz or .zip archive'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        help='Decoding worker processes for batches (default: CPU count)'
+    )
+    
+    parser.add_argument(
+        '--max-buffer',
+        type=int,
+        default=64,
+        help='Cap on batch data in flight between read, decode and write, in MB (default: 64)'
+    )
+    
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='Decode byte-identical files separately instead of hardlinking one output'
+    )
+    
+    parser.add_argument(
+        '--fsync',
+        choices=SYNC_POLICIES,
+        default='none',
+        help='Durability of written files: none, file (fsync each) or batch '
+             '(one flush at the end of the run) (default: none)'
     )
     
     parser.add_argument(
@@ -267,37 +769,81 @@ Examples:
     if args.files and args.directory:
         parser.error("Cannot specify both files and directory")
     
+    if args.archive and (args.output or args.files == ['-']):
+        parser.error("--archive cannot be combined with -o or pipe mode")
+    
+    if args.depth < 1 or args.max_layers < 1:
+        parser.error("Layer limits must be at least 1")
+    
+    max_layers = args.max_layers if args.until_plain else args.depth
+    max_size = args.max_size * 1024 * 1024
+    
     # Initialize decoder
     decoder = PyDecoder()
     
+    # Pipe mode: stream between stdin/file and stdout, no files written
+    if args.files == ['-'] or args.output == '-':
+        if len(args.files) != 1:
+            parser.error('Pipe mode takes exactly one input')
+        try:
+            if args.files[0] == '-':
+                chain = decoder.decode_stream(sys.stdin.buffer, sys.stdout.buffer, max_layers, max_size)
+            else:
+                with open(args.files[0], 'rb') as source:
+                    chain = decoder.decode_stream(source, sys.stdout.buffer, max_layers, max_size)
+            if args.verbose:
+                print(f"✓ Decoded {len(chain)} layer(s): {' -> '.join(chain)}", file=sys.stderr)
+            return 0
+        except Exception as e:
+            print(f"✗ Failed to decode {args.files[0]}: {e}", file=sys.stderr)
+            return 1
+    
+    # Batch fsync policy and archives commit all outputs when the with-block exits
+    if args.archive:
+        decoder.writer = ArchiveWriter(args.archive, base_dir=args.directory, sync=args.fsync)
+    else:
+        decoder.writer = AtomicWriter(sync=args.fsync)
+    
     try:
-        # Determine input files
-        if args.directory:
-            input_files = decoder.find_python_files(args.directory, args.recursive)
-            if not input_files:
-                print("No Python files found in the specified directory")
-                return 1
-        else:
-            input_files = args.files
-        
-        if args.verbose:
-            print(f"Found {len(input_files)} Python file(s) to decode")
-            for f in input_files:
-                print(f"  - {f}")
-            print()
-        
-        # Decode files
-        if len(input_files) == 1:
-            try:
-                output_path = decoder.decode_single_file(input_files[0], args.output)
-                print(f"✓ Successfully decoded: {input_files[0]} -> {output_path}")
-                return 0
-            except Exception as e:
-                print(f"✗ Failed to decode {input_files[0]}: {e}", file=sys.stderr)
-                return 1
-        else:
-            results = decoder.decode_multiple_files(input_files, args.output)
-            return 0 if results else 1
+        with decoder.writer:
+            # Determine input files
+            if args.directory:
+                input_files = decoder.find_python_files(args.directory, args.recursive)
+                if not input_files:
+                    print("No Python files found in the specified directory")
+                    return 1
+            
+                # Skip plain scripts using one small header read per file
+                candidates = [f for f in input_files if classify_file(f)[0] != PLAIN]
+                if args.verbose and len(candidates) != len(input_files):
+                    print(f"Skipping {len(input_files) - len(candidates)} plain Python file(s)")
+                if not candidates:
+                    print("No obfuscated Python files found in the specified directory")
+                    return 1
+                input_files = candidates
+            else:
+                input_files = args.files
+            
+            if args.verbose:
+                print(f"Found {len(input_files)} Python file(s) to decode")
+                for f in input_files:
+                    print(f"  - {f}")
+                print()
+            
+            # Decode files
+            if len(input_files) == 1:
+                try:
+                    output_path = decoder.decode_single_file(input_files[0], args.output, max_layers, max_size)
+                    print(f"✓ Successfully decoded: {input_files[0]} -> {output_path}{decoder.format_chain(input_files[0])}")
+                    return 0
+                except Exception as e:
+                    print(f"✗ Failed to decode {input_files[0]}: {e}", file=sys.stderr)
+                    return 1
+            else:
+                results = decoder.decode_multiple_files(input_files, args.output, max_layers, max_size,
+                                                        args.jobs, args.max_buffer * 1024 * 1024,
+                                                        not args.no_dedup)
+                return 0 if results else 1
     
     except KeyboardInterrupt:
         print("\nOperation cancelled by user", file=sys.stderr)
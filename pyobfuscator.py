@@ -4,12 +4,15 @@ Python Script Obfuscator Tool
 A command-line tool for encoding and obfuscating Python scripts using base64 encoding.
 """
 
-import os
+from __future__ import annotations
+
 import sys
 import base64
-import argparse
 import pathlib
-from typing import List, Optional
+
+# Bytes read per step in stream mode; a multiple of 3 so every full chunk
+# encodes to base64 without padding
+STREAM_CHUNK = 48 * 1024
 
 
 class PyObfuscator:
@@ -18,6 +21,13 @@ class PyObfuscator:
     def __init__(self):
         self.supported_extensions = ['.py', '.pyw']
         self.obfuscated_suffix = '_obfuscated'
+        self.payload_suffix = '.dusk'
+        # Payload path -> source stored there in this run, to catch name clashes
+        self.stored_payloads = {}
+        from dusk_output import AtomicWriter
+        self.writer = AtomicWriter()
+        self.sidecar = False
+        self.shm_cache = False
     
     def is_python_file(self, file_path: pathlib.Path) -> bool:
         """Check if the file is a Python script."""
@@ -59,7 +69,159 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
 '''
         return obfuscated_template
     
-    def generate_output_path(self, input_path: pathlib.Path, output_dir: Optional[str] = None) -> pathlib.Path:
+    def payload_key(self, encoded_content: str | bytes) -> str:
+        """Short hash of an encoded payload, naming its shared-memory segment."""
+        import hashlib
+        if isinstance(encoded_content, str):
+            encoded_content = encoded_content.encode('ascii')
+        return hashlib.sha256(encoded_content).hexdigest()[:14]
+    
+    def create_shared_script(self, encoded_content: str, key: str | None = None) -> str:
+        """Create a wrapper that shares its compiled code between processes.
+        
+        The first process to run the wrapper publishes the marshalled code
+        in a shared-memory segment named after the payload hash and the
+        interpreter version; later processes load it from there instead of
+        decoding and compiling again. The owner unlinks the segment when it
+        exits. Segments not owned by the current user, half-written ones or
+        a missing ``multiprocessing.shared_memory`` fall back to a local
+        decode. The payload comes first, so the wrapper still reads as a
+        standard base64 wrapper to the classifier and decoder.
+        """
+        key = key or self.payload_key(encoded_content)
+        return f'''#!/usr/bin/env python3
+import base64
+unknownkcc = """{encoded_content}"""
+def _dusk_code(payload, key):
+    import marshal, os, sys
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        return compile(base64.b64decode(payload), "<string>", "exec")
+    name = "dusk_%s_%x" % (key, sys.hexversion)
+    try:
+        try:
+            shm = shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            # Before 3.13 attaching registers with the resource tracker,
+            # which would unlink the segment when this process exits
+            from multiprocessing import resource_tracker
+            register, resource_tracker.register = resource_tracker.register, lambda *args: None
+            try:
+                shm = shared_memory.SharedMemory(name)
+            finally:
+                resource_tracker.register = register
+    except Exception:
+        shm = None
+    if shm is not None:
+        try:
+            st = os.fstat(shm._fd) if os.name == "posix" else None
+            if (st is None or st.st_uid == os.getuid() and not st.st_mode & 0o022) \\
+                    and bytes(shm.buf[:5]) == b"DUSK\\1":
+                view = shm.buf[16:16 + int.from_bytes(shm.buf[8:16], "little")]
+                try:
+                    return marshal.loads(view)
+                finally:
+                    view.release()
+        except Exception:
+            pass
+        finally:
+            shm.close()
+    code = compile(base64.b64decode(payload), "<string>", "exec")
+    try:
+        data = marshal.dumps(code)
+        shm = shared_memory.SharedMemory(name, create=True, size=16 + len(data))
+    except Exception:
+        return code
+    shm.buf[16:16 + len(data)] = data
+    shm.buf[8:16] = len(data).to_bytes(8, "little")
+    shm.buf[:5] = b"DUSK\\1"
+    def release():
+        shm.close()
+        try:
+            shm.unlink()
+        except OSError:
+            pass
+    import atexit
+    atexit.register(release)
+    return code
+exec(_dusk_code(unknownkcc, "{key}"))
+'''
+    
+    def create_sidecar_stub(self) -> str:
+        """Create the stub that runs a payload from its sidecar file.
+        
+        The stub finds the sidecar from its own path, mmaps it and
+        decompresses straight from the mapping, so nothing has to tokenize
+        a giant string literal. All stubs are identical, whatever the script.
+        """
+        from dusk_classifier import SIDECAR_MARKER, SIDECAR_SUFFIX
+        return f'''#!/usr/bin/env python3
+{SIDECAR_MARKER} payload is the {SIDECAR_SUFFIX} file next to this script
+import mmap, os, zlib
+with open(os.path.splitext(__file__)[0] + "{SIDECAR_SUFFIX}", "rb") as f:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        unknownkcc = zlib.decompress(m)
+eval(compile(unknownkcc, __file__, "exec"))
+'''
+    
+    def create_sidecar_payload(self, script_content: str) -> bytes:
+        """Create the binary sidecar: the zlib-compressed script."""
+        import zlib
+        return zlib.compress(script_content.encode('utf-8'), 6)
+    
+    def sidecar_path(self, output_path: str | pathlib.Path) -> pathlib.Path:
+        """Sidecar file belonging to a stub path."""
+        from dusk_classifier import SIDECAR_SUFFIX
+        return pathlib.Path(output_path).with_suffix(SIDECAR_SUFFIX)
+    
+    def obfuscate_stream(self, source, sink, chunk_size: int = STREAM_CHUNK) -> int:
+        """Encode a script from a binary stream into a wrapper on another.
+        
+        The payload is encoded chunk by chunk as it is read, so no more than
+        one chunk is held in memory. The whole script is never available, so
+        the syntax check of file mode is skipped. Returns bytes read.
+        """
+        if self.shm_cache:
+            import hashlib
+            # The segment key follows the payload, so hash it on the way out
+            digest = hashlib.sha256()
+            head = self.create_shared_script('\0', '-').split('\0')[0]
+        else:
+            digest = None
+            head, tail = self.create_obfuscated_script('\0').split('\0')
+        read = getattr(source, 'read1', source.read)
+        carry = b''
+        total = 0
+        
+        while True:
+            chunk = read(chunk_size)
+            if not chunk:
+                break
+            if not total:
+                sink.write(head.encode('ascii'))
+            total += len(chunk)
+            data = carry + chunk
+            cut = len(data) - len(data) % 3
+            carry = data[cut:]
+            encoded = base64.b64encode(data[:cut])
+            if digest:
+                digest.update(encoded)
+            sink.write(encoded)
+        
+        if not total:
+            raise ValueError("Script input is empty")
+        
+        encoded = base64.b64encode(carry)
+        sink.write(encoded)
+        if digest:
+            digest.update(encoded)
+            tail = self.create_shared_script('\0', digest.hexdigest()[:14]).split('\0')[1]
+        sink.write(tail.encode('ascii'))
+        sink.flush()
+        return total
+    
+    def generate_output_path(self, input_path: pathlib.Path, output_dir: str | None = None) -> pathlib.Path:
         """Generate output file path for obfuscated script."""
         if output_dir:
             output_directory = pathlib.Path(output_dir)
@@ -71,26 +233,46 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
             filename = input_path.stem + self.obfuscated_suffix + input_path.suffix
             return input_path.parent / filename
     
-    def write_obfuscated_script(self, obfuscated_content: str, output_path: pathlib.Path) -> None:
-        """Write obfuscated script to file."""
+    def write_output(self, result: str | bytes, output_path: pathlib.Path) -> str:
+        """Write a wrapper script, or a sidecar payload and its stub."""
+        if isinstance(result, bytes):
+            # Sidecar first, so the stub never points at a missing payload
+            sidecar_path = self.sidecar_path(output_path)
+            try:
+                self.writer.write(sidecar_path, result, mode=0o644)
+            except PermissionError:
+                raise PermissionError(f"Permission denied writing to: {sidecar_path}")
+            result = self.create_sidecar_stub()
+        return self.write_obfuscated_script(result, output_path)
+    
+    def write_obfuscated_script(self, obfuscated_content: str, output_path: pathlib.Path) -> str:
+        """Write obfuscated script through the output writer, returns where it went."""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(obfuscated_content)
-            
-            # Make the file executable on Unix-like systems
-            if os.name == 'posix':
-                os.chmod(output_path, 0o755)
-                
+            # Temp file + rename; created executable, no separate chmod
+            return self.writer.write(output_path, obfuscated_content, mode=0o755)
         except PermissionError:
             raise PermissionError(f"Permission denied writing to: {output_path}")
         except Exception as e:
             raise Exception(f"Failed to write obfuscated script: {e}")
     
-    def obfuscate_single_file(self, input_file: str, output_dir: Optional[str] = None) -> str:
+    def obfuscate_single_file(self, input_file: str, output_dir: str | None = None) -> str:
         """Obfuscate a single Python file."""
+        input_path = self.validate_input(input_file)
+        
+        # Read, validate and encode the script
+        result = self.obfuscate_content(self.read_script(input_path), input_file,
+                                        self.sidecar, self.shm_cache)
+        
+        # Generate output path
+        output_path = self.generate_output_path(input_path, output_dir)
+        
+        # Write obfuscated script
+        return self.write_output(result, output_path)
+    
+    def validate_input(self, input_file: str) -> pathlib.Path:
+        """Check that an input path is an existing Python file."""
         input_path = pathlib.Path(input_file)
         
-        # Validate input file
         if not input_path.exists():
             raise FileNotFoundError(f"Input file does not exist: {input_file}")
         
@@ -100,47 +282,89 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         if not self.is_python_file(input_path):
             raise ValueError(f"File is not a Python script: {input_file}")
         
-        # Read and validate script content
-        script_content = self.read_script(input_path)
-        
+        return input_path
+    
+    def obfuscate_content(self, script_content: str, input_file: str,
+                          sidecar: bool = False, shm_cache: bool = False) -> str | bytes:
+        """Validate script source and build its wrapper, or its sidecar payload."""
         if not script_content.strip():
             raise ValueError(f"Script file is empty: {input_file}")
         
         # Try to compile the script to check for syntax errors
         try:
-            compile(script_content, str(input_path), 'exec')
+            compile(script_content, input_file, 'exec')
         except SyntaxError as e:
             raise SyntaxError(f"Syntax error in script {input_file}: {e}")
         
-        # Encode the script
-        encoded_content = self.encode_script(script_content)
-        
-        # Create obfuscated script
-        obfuscated_script = self.create_obfuscated_script(encoded_content)
+        if sidecar:
+            return self.create_sidecar_payload(script_content)
+        if shm_cache:
+            return self.create_shared_script(self.encode_script(script_content))
+        return self.create_obfuscated_script(self.encode_script(script_content))
+    
+    def obfuscate_multiple_files(self, input_files: list[str], output_dir: str | None = None,
+                                 workers: int | None = None,
+                                 max_bytes: int | None = None, dedup: bool = True) -> list[str]:
+        """Obfuscate multiple Python files.
         
-        # Generate output path
-        output_path = self.generate_output_path(input_path, output_dir)
+        Reading, encoding and writing run as overlapping pipeline stages
+        whose in-flight data is capped at ``max_bytes`` (None for the
+        pipeline default). With ``dedup``, byte-identical inputs are encoded
+        once and their outputs hardlinked (or rewritten where links are not
+        possible).
+        """
+        import functools
+        from dusk_pipeline import run_pipeline, find_duplicates, DEFAULT_MAX_BYTES
         
-        # Write obfuscated script
-        self.write_obfuscated_script(obfuscated_script, output_path)
+        if max_bytes is None:
+            max_bytes = DEFAULT_MAX_BYTES
         
-        return str(output_path)
-    
-    def obfuscate_multiple_files(self, input_files: List[str], output_dir: Optional[str] = None) -> List[str]:
-        """Obfuscate multiple Python files."""
-        results = []
         errors = []
+        results = []
         
-        for input_file in input_files:
-            try:
-                output_path = self.obfuscate_single_file(input_file, output_dir)
-                results.append(output_path)
-                print(f"✓ Successfully obfuscated: {input_file} -> {output_path}")
-            except Exception as e:
-                error_msg = f"✗ Failed to obfuscate {input_file}: {e}"
-                errors.append(error_msg)
-                print(error_msg, file=sys.stderr)
+        if dedup:
+            unique_files, duplicates, saved_bytes = find_duplicates(input_files)
+        else:
+            unique_files, duplicates, saved_bytes = input_files, {}, 0
+        fanned_out = {}
+        
+        def read(input_file):
+            self.validate_input(input_file)
+            with open(input_file, 'rb') as f:
+                return input_file, f.read()
+        
+        def write(input_file, obfuscated_script):
+            output_path = self.generate_output_path(pathlib.Path(input_file), output_dir)
+            output_path = self.write_output(obfuscated_script, output_path)
+            for duplicate in duplicates.get(input_file, ()):
+                try:
+                    fanned_out[duplicate] = (self.copy_output(output_path, duplicate, output_dir,
+                                                              obfuscated_script), None)
+                except Exception as e:
+                    fanned_out[duplicate] = (None, e)
+            return output_path
+        
+        def report(input_file, output_path, error):
+            for path in [input_file] + duplicates.get(input_file, []):
+                if path != input_file:
+                    output_path, error = fanned_out.get(path, (None, error))
+                if error:
+                    error_msg = f"✗ Failed to obfuscate {path}: {error}"
+                    errors.append(error_msg)
+                    print(error_msg, file=sys.stderr)
+                else:
+                    results.append(output_path)
+                    print(f"✓ Successfully obfuscated: {path} -> {output_path}")
         
+        transform = functools.partial(obfuscate_file_data, sidecar=self.sidecar,
+                                      shm_cache=self.shm_cache)
+        run_pipeline(unique_files, read, transform, write,
+                     workers=workers, max_bytes=max_bytes,
+                     ordered=self.writer.ordered, on_done=report)
+        
+        if saved_bytes:
+            print(f"\nDeduplicated {len(input_files) - len(unique_files)} identical file(s), "
+                  f"skipped encoding {saved_bytes} bytes")
         if errors:
             print(f"\nCompleted with {len(errors)} error(s) out of {len(input_files)} file(s)")
         else:
@@ -148,7 +372,65 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         
         return results
     
-    def find_python_files(self, directory: str, recursive: bool = False) -> List[str]:
+    def copy_output(self, existing_output: str, input_file: str, output_dir: str | None,
+                    result: str | bytes) -> str:
+        """Give a duplicate input the output already written for its twin."""
+        self.validate_input(input_file)
+        output_path = self.generate_output_path(pathlib.Path(input_file), output_dir)
+        try:
+            if isinstance(result, bytes):
+                self.writer.link(self.sidecar_path(existing_output), self.sidecar_path(output_path))
+            return self.writer.link(existing_output, output_path)
+        except OSError:
+            return self.write_output(result, output_path)
+    
+    def generate_payload_path(self, input_path: pathlib.Path, store_dir: str,
+                              base_dir: str | None = None) -> pathlib.Path:
+        """Generate payload store path, keeping the package layout under base_dir."""
+        if base_dir:
+            relative = input_path.resolve().relative_to(pathlib.Path(base_dir).resolve())
+        else:
+            relative = pathlib.Path(input_path.name)
+        payload_path = pathlib.Path(store_dir) / relative.with_suffix(self.payload_suffix)
+        payload_path.parent.mkdir(parents=True, exist_ok=True)
+        return payload_path
+    
+    def store_single_file(self, input_file: str, store_dir: str, base_dir: str | None = None) -> str:
+        """Encode a single Python file into the payload store used by dusk_loader."""
+        input_path = pathlib.Path(input_file)
+        
+        if not input_path.is_file():
+            raise FileNotFoundError(f"Input file does not exist: {input_file}")
+        
+        if not self.is_python_file(input_path):
+            raise ValueError(f"File is not a Python script: {input_file}")
+        
+        script_content = self.read_script(input_path)
+        
+        try:
+            compile(script_content, str(input_path), 'exec')
+        except SyntaxError as e:
+            raise SyntaxError(f"Syntax error in script {input_file}: {e}")
+        
+        # Without base_dir payloads are named after the file alone, so two
+        # sources with the same name would overwrite each other
+        payload_path = self.generate_payload_path(input_path, store_dir, base_dir)
+        previous = self.stored_payloads.setdefault(payload_path, input_path.resolve())
+        if previous != input_path.resolve():
+            raise FileExistsError(f"{payload_path} is already stored from {previous}; "
+                                  f"use -d to keep the package layout")
+        
+        # Payloads are bare base64, no wrapper - dusk_loader decodes them on import
+        encoded_content = self.encode_script(script_content)
+        
+        try:
+            self.writer.write(payload_path, encoded_content, mode=0o644)
+        except PermissionError:
+            raise PermissionError(f"Permission denied writing to: {payload_path}")
+        
+        return str(payload_path)
+    
+    def find_python_files(self, directory: str, recursive: bool = False) -> list[str]:
         """Find Python files in a directory."""
         directory_path = pathlib.Path(directory)
         
@@ -167,11 +449,28 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
             for ext in self.supported_extensions:
                 python_files.extend(directory_path.glob(f'*{ext}'))
         
-        return [str(f) for f in python_files]
+        return sorted(str(f) for f in python_files)
+
+
+def obfuscate_file_data(item: tuple[str, bytes], sidecar: bool = False,
+                        shm_cache: bool = False) -> str | bytes:
+    """Pipeline stage: (path, raw bytes) -> wrapper script or sidecar payload.
+    
+    Module-level so the batch pipeline can run it in a process pool.
+    """
+    input_file, data = item
+    try:
+        script_content = data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError(f"Cannot decode file (not UTF-8): {input_file}")
+    return PyObfuscator().obfuscate_content(script_content, input_file, sidecar, shm_cache)
 
 
 def main():
     """Main function to handle command line arguments and execute obfuscation."""
+    import argparse
+    from dusk_output import AtomicWriter, ArchiveWriter, SYNC_POLICIES
+
     parser = argparse.ArgumentParser(
         description='Python Script Obfuscator - Encode Python scripts using base64',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -182,6 +481,11 @@ Examples:
   %(prog)s -d /path/to/scripts          # Obfuscate all Python files in directory
   %(prog)s -d /path/to/scripts -r       # Obfuscate recursively
   %(prog)s script.py -o /output/dir     # Specify output directory
+  %(prog)s -d src -r --store build      # Build payload store for dusk_loader
+  git show HEAD:x.py | %(prog)s - > out.py  # Pipe mode: stdin to stdout
+  %(prog)s script.py -o -               # Write the wrapper to stdout
+  %(prog)s huge.py --sidecar            # Stub + mmap'd compressed payload
+  %(prog)s worker.py --shm-cache        # Processes share one decoded copy
         """
     )
     
@@ -189,7 +493,7 @@ Examples:
     parser.add_argument(
         'files',
         nargs='*',
-        help='Python files to obfuscate'
+        help='Python files to obfuscate ("-" reads stdin and writes stdout)'
     )
     
     parser.add_argument(
@@ -205,7 +509,60 @@ Examples:
     
     parser.add_argument(
         '-o', '--output',
-        help='Output directory for obfuscated files'
+        help='Output directory for obfuscated files ("-" writes a single file to stdout)'
+    )
+    
+    parser.add_argument(
+        '--store',
+        metavar='DIR',
+        help='Write bare payloads into a store directory importable via dusk_loader'
+    )
+    
+    parser.add_argument(
+        '--archive',
+        metavar='FILE',
+        help='Write all outputs into one reproducible .tar, .tar.gz or .zip archive'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        help='Encoding worker processes for batches (default: CPU count)'
+    )
+    
+    parser.add_argument(
+        '--max-buffer',
+        type=int,
+        default=64,
+        help='Cap on batch data in flight between read, encode and write, in MB (default: 64)'
+    )
+    
+    parser.add_argument(
+        '--sidecar',
+        action='store_true',
+        help='Write a small stub plus a compressed sidecar payload file the stub mmaps '
+             '(fast startup for very large scripts)'
+    )
+    
+    parser.add_argument(
+        '--shm-cache',
+        action='store_true',
+        help='Generate wrappers whose first process publishes the compiled code in shared '
+             'memory for later processes of the same script'
+    )
+    
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='Encode byte-identical files separately instead of hardlinking one output'
+    )
+    
+    parser.add_argument(
+        '--fsync',
+        choices=SYNC_POLICIES,
+        default='none',
+        help='Durability of written files: none, file (fsync each) or batch '
+             '(one flush at the end of the run) (default: none)'
     )
     
     parser.add_argument(
@@ -229,37 +586,86 @@ Examples:
     if args.files and args.directory:
         parser.error("Cannot specify both files and directory")
     
+    if args.archive and (args.output or args.store or args.files == ['-']):
+        parser.error("--archive cannot be combined with -o, --store or pipe mode")
+    
+    if args.sidecar and (args.store or args.files == ['-'] or args.output == '-'):
+        parser.error("--sidecar cannot be combined with --store or pipe mode")
+    
+    if args.shm_cache and (args.sidecar or args.store):
+        parser.error("--shm-cache cannot be combined with --sidecar or --store")
+    
     # Initialize obfuscator
     obfuscator = PyObfuscator()
+    obfuscator.sidecar = args.sidecar
+    obfuscator.shm_cache = args.shm_cache
+    
+    # Pipe mode: stream between stdin/file and stdout, no files written
+    if args.files == ['-'] or args.output == '-':
+        if len(args.files) != 1 or args.store:
+            parser.error('Pipe mode takes exactly one input and no --store')
+        try:
+            if args.files[0] == '-':
+                total = obfuscator.obfuscate_stream(sys.stdin.buffer, sys.stdout.buffer)
+            else:
+                with open(args.files[0], 'rb') as source:
+                    total = obfuscator.obfuscate_stream(source, sys.stdout.buffer)
+            if args.verbose:
+                print(f"✓ Obfuscated {total} bytes to stdout", file=sys.stderr)
+            return 0
+        except Exception as e:
+            print(f"✗ Failed to obfuscate {args.files[0]}: {e}", file=sys.stderr)
+            return 1
+    
+    # Batch fsync policy and archives commit all outputs when the with-block exits
+    if args.archive:
+        obfuscator.writer = ArchiveWriter(args.archive, base_dir=args.directory, sync=args.fsync)
+    else:
+        obfuscator.writer = AtomicWriter(sync=args.fsync)
     
     try:
-        # Determine input files
-        if args.directory:
-            input_files = obfuscator.find_python_files(args.directory, args.recursive)
-            if not input_files:
-                print("No Python files found in the specified directory")
-                return 1
-        else:
-            input_files = args.files
-        
-        if args.verbose:
-            print(f"Found {len(input_files)} Python file(s) to obfuscate")
-            for f in input_files:
-                print(f"  - {f}")
-            print()
-        
-        # Obfuscate files
-        if len(input_files) == 1:
-            try:
-                output_path = obfuscator.obfuscate_single_file(input_files[0], args.output)
-                print(f"✓ Successfully obfuscated: {input_files[0]} -> {output_path}")
-                return 0
-            except Exception as e:
-                print(f"✗ Failed to obfuscate {input_files[0]}: {e}", file=sys.stderr)
-                return 1
-        else:
-            results = obfuscator.obfuscate_multiple_files(input_files, args.output)
-            return 0 if results else 1
+        with obfuscator.writer:
+            # Determine input files
+            if args.directory:
+                input_files = obfuscator.find_python_files(args.directory, args.recursive)
+                if not input_files:
+                    print("No Python files found in the specified directory")
+                    return 1
+            else:
+                input_files = args.files
+            
+            if args.verbose:
+                print(f"Found {len(input_files)} Python file(s) to obfuscate")
+                for f in input_files:
+                    print(f"  - {f}")
+                print()
+            
+            # Build payload store instead of wrapper scripts
+            if args.store:
+                failures = 0
+                for input_file in input_files:
+                    try:
+                        payload_path = obfuscator.store_single_file(input_file, args.store, args.directory)
+                        print(f"✓ Stored: {input_file} -> {payload_path}")
+                    except Exception as e:
+                        failures += 1
+                        print(f"✗ Failed to store {input_file}: {e}", file=sys.stderr)
+                return 1 if failures else 0
+            
+            # Obfuscate files
+            if len(input_files) == 1:
+                try:
+                    output_path = obfuscator.obfuscate_single_file(input_files[0], args.output)
+                    print(f"✓ Successfully obfuscated: {input_files[0]} -> {output_path}")
+                    return 0
+                except Exception as e:
+                    print(f"✗ Failed to obfuscate {input_files[0]}: {e}", file=sys.stderr)
+                    return 1
+            else:
+                results = obfuscator.obfuscate_multiple_files(input_files, args.output, args.jobs,
+                                                              args.max_buffer * 1024 * 1024,
+                                                              not args.no_dedup)
+                return 0 if results else 1
     
     except KeyboardInterrupt:
         print("\nOperation cancelled by user", file=sys.stderr)
@@ -0,0 +1,54 @@
+"""Tests for the non-interactive dusk_cipher subcommands."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'dusk_cipher.py')
+
+
+def run_cipher(*args, cwd):
+    return subprocess.run([sys.executable, SCRIPT, *args], cwd=cwd,
+                          capture_output=True, text=True)
+
+
+class DirectoryBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        for package, value in (('a', 1), ('b', 2)):
+            os.makedirs(os.path.join(self.tmp, 'src', package))
+            with open(os.path.join(self.tmp, 'src', package, '__init__.py'), 'w') as f:
+                f.write(f"VALUE = {value}\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_same_basename_in_subdirectories(self):
+        proc = run_cipher('encrypt', 'src', '-o', 'build', cwd=self.tmp)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+        for package in ('a', 'b'):
+            output = os.path.join(self.tmp, 'build', package, '__init___encrypted.py')
+            self.assertTrue(os.path.isfile(output), output)
+
+        proc = run_cipher('decrypt', 'build', '-o', 'out', cwd=self.tmp)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+        for package, value in (('a', 1), ('b', 2)):
+            with open(os.path.join(self.tmp, 'out', package, '__init___decrypted.py')) as f:
+                self.assertEqual(f.read(), f"VALUE = {value}\n")
+
+    def test_explicit_files_sharing_a_basename_clash(self):
+        proc = run_cipher('encrypt', os.path.join('src', 'a', '__init__.py'),
+                          os.path.join('src', 'b', '__init__.py'), '-o', 'build', cwd=self.tmp)
+        self.assertEqual(proc.returncode, 1)
+        self.assertIn('already written from', proc.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
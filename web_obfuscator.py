@@ -5,32 +5,217 @@ A simple web interface for encoding Python scripts using base64.
 """
 
 import base64
-import html
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
 import os
 import sys
+import time
+import zlib
+import signal
+import functools
+import threading
+import urllib.parse
+
+from dusk_admission import RouteLimiter, Overloaded
+from dusk_workers import WorkerPool, JobTimeout, WorkerCrashed, DEFAULT_JOB_TIMEOUT
+from dusk_accesslog import AccessLog
+from dusk_jobs import (JobStore, DONE, FAILED, DEFAULT_JOB_WORKERS, DEFAULT_MAX_PENDING,
+                       DEFAULT_RESULT_TTL, DEFAULT_MAX_BYTES)
+
+# Request limits (overridable from the command line)
+DEFAULT_MAX_BODY = 10 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_MAX_WAIT = 2.0
+
+# Raw code bodies accepted and returned besides JSON, chosen by the
+# Content-Type and Accept headers
+RAW_TYPES = ('text/x-python', 'application/octet-stream', 'text/plain')
+
+# Responses smaller than this are sent uncompressed; larger ones are
+# compressed in chunks straight onto the socket
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_CHUNK = 256 * 1024
+COMPRESS_LEVEL = 6
+
+# zlib window bits for each supported Content-Encoding
+CONTENT_ENCODINGS = {'gzip': 31, 'deflate': 15}
+
+# Job progress streams poll the shared job store this often, and send a
+# keepalive comment when nothing changed for SSE_HEARTBEAT seconds
+SSE_POLL_INTERVAL = 0.25
+SSE_HEARTBEAT = 15.0
+
+# Seconds in-flight requests get to finish on shutdown
+DEFAULT_DRAIN_TIMEOUT = 30.0
+
+# A rejected body up to this many times the limit is read and discarded, so
+# the client gets to read the error instead of a connection reset
+DISCARD_FACTOR = 4
 
 class ObfuscatorWebHandler(BaseHTTPRequestHandler):
+    # Idle socket timeout, so a stalled upload cannot hold a slot forever
+    timeout = 60
+    
+    def setup(self):
+        super().setup()
+        if self.server.access_log:
+            self.wfile = CountingWriter(self.wfile)
+    
+    def parse_request(self):
+        # Per-request state, reset for every request on a connection
+        self.start_time = time.monotonic()
+        self.status = None
+        self.body_length = 0
+        self.queue_time = None
+        self.handler_time = None
+        return super().parse_request()
+    
+    def handle_one_request(self):
+        self.command = None
+        bytes_before = getattr(self.wfile, 'count', 0)
+        super().handle_one_request()
+        if self.command and self.server.access_log:
+            self.log_access(self.wfile.count - bytes_before)
+    
+    def log_request(self, code='-', size='-'):
+        """Remember the status for the access log (send_response calls this)"""
+        self.status = int(code) if str(code).isdigit() else None
+    
+    def log_access(self, bytes_out):
+        """Queue a structured access log record for the request just handled"""
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 3)
+        
+        self.server.access_log.log({
+            'ts': round(time.time(), 3),
+            'pid': os.getpid(),
+            'client': self.client_address[0],
+            'method': self.command,
+            'route': self.path.split('?')[0],
+            'status': self.status,
+            'bytes_in': self.body_length,
+            'bytes_out': bytes_out,
+            'queue_ms': ms(self.queue_time),
+            'handler_ms': ms(self.handler_time),
+            'total_ms': ms(time.monotonic() - self.start_time),
+        })
+    
     def do_GET(self):
         """Handle GET requests - serve the web interface"""
         if self.path == '/' or self.path == '/index.html':
             self.serve_homepage()
         elif self.path == '/style.css':
             self.serve_css()
+        elif self.path == '/healthz':
+            self.send_json_response({'status': 'ok', 'pid': os.getpid()})
+        elif self.path == '/readyz':
+            self.serve_readiness()
+        elif self.path.startswith('/jobs/'):
+            self.serve_job()
         else:
             self.send_error(404)
     
     def do_POST(self):
         """Handle POST requests - process obfuscation"""
         if self.path == '/obfuscate':
-            self.handle_obfuscation()
+            self.run_admitted(self.handle_obfuscation)
         elif self.path == '/deobfuscate':
-            self.handle_deobfuscation()
+            self.run_admitted(self.handle_deobfuscation)
+        elif self.path == '/validate':
+            self.run_admitted(self.handle_validation)
+        elif self.path.split('?')[0] == '/jobs':
+            self.run_admitted(self.handle_job_submission)
         else:
             self.send_error(404)
     
+    def run_admitted(self, handler):
+        """Run a POST handler under the body-size and concurrency limits of its route"""
+        if not self.check_body_length():
+            return
+        
+        limiter = self.server.limiters[self.path.split('?')[0]]
+        try:
+            self.queue_time = limiter.acquire()
+        except Overloaded as e:
+            self.discard_body(self.body_length)
+            self.send_json_response({'success': False, 'error': f'Server sedang sibuk ({e}), coba lagi nanti'},
+                                    status=503, headers={'Retry-After': str(e.retry_after)})
+            return
+        
+        start = time.monotonic()
+        try:
+            if self.load_body():
+                handler()
+        finally:
+            self.handler_time = time.monotonic() - start
+            limiter.release(self.handler_time)
+    
+    def check_body_length(self):
+        """Validate Content-Length against the server limit, answering 400/411/413 if needed"""
+        length = self.headers.get('Content-Length')
+        if length is None:
+            status, error = 411, 'Content-Length wajib diisi'
+        elif not length.strip().isdigit():
+            status, error = 400, 'Content-Length tidak valid'
+        elif int(length) > self.server.max_body:
+            status, error = 413, f'Request terlalu besar (maksimal {self.server.max_body} bytes)'
+        elif self.content_encoding() not in CONTENT_ENCODINGS and self.content_encoding() != 'identity':
+            status, error = 415, f'Content-Encoding tidak didukung: {self.content_encoding()}'
+        else:
+            self.body_length = int(length)
+            return True
+        
+        if status in (413, 415):
+            self.discard_body(int(length))
+        else:
+            self.close_connection = True
+        self.send_json_response({'success': False, 'error': error}, status=status)
+        return False
+    
+    def discard_body(self, length):
+        """Drop an unwanted request body in small reads and close the connection"""
+        self.close_connection = True
+        if length > self.server.max_body * DISCARD_FACTOR:
+            return
+        while length > 0:
+            chunk = self.rfile.read(min(length, 64 * 1024))
+            if not chunk:
+                break
+            length -= len(chunk)
+    
+    def content_encoding(self):
+        return (self.headers.get('Content-Encoding') or 'identity').strip().lower()
+    
+    def load_body(self):
+        """Read the request body, decompressing gzip/deflate up to the size limit
+        
+        Answers 400 (corrupt data) or 413 (expands past the limit) and
+        returns False when the body cannot be used.
+        """
+        body = self.rfile.read(self.body_length)
+        wbits = CONTENT_ENCODINGS.get(self.content_encoding())
+        if wbits is not None:
+            decompressor = zlib.decompressobj(wbits)
+            try:
+                expanded = decompressor.decompress(body, self.server.max_body)
+                if decompressor.unconsumed_tail:
+                    self.send_failure(f'Request terlalu besar setelah dekompresi '
+                                      f'(maksimal {self.server.max_body} bytes)', 413)
+                    return False
+                if not decompressor.eof:
+                    raise zlib.error('truncated stream')
+            except zlib.error as e:
+                self.send_failure(f'Body {self.content_encoding()} rusak: {e}', 400)
+                return False
+            body = expanded
+        self.body = body
+        return True
+    
+    def read_body(self):
+        """The request body loaded by load_body"""
+        return self.body
+    
     def serve_homepage(self):
         """Serve the main HTML page"""
         html_content = """
@@ -68,6 +253,13 @@ print(f'Halo {name}!')"></textarea>
                 <button onclick="obfuscateCode()" id="obfuscateBtn">🔒 Encode Script</button>
                 <button onclick="clearEncode()" id="clearEncodeBtn">🗑️ Clear</button>
             </div>
+            <label class="option">
+                <input type="checkbox" id="validateSyntax"> Validasi syntax di server sebelum encode
+            </label>
+            <div class="progress" id="encodeProgress" hidden>
+                <progress max="1" value="0"></progress>
+                <span class="progress-label"></span>
+            </div>
             
             <h2>🔐 Hasil Encode:</h2>
             <textarea id="outputCode" readonly placeholder="Hasil encode akan muncul di sini..."></textarea>
@@ -92,6 +284,10 @@ eval(compile(base64.b64decode(unknownkcc), \"<string>\", \"exec\"))"></textarea>
                 <button onclick="deobfuscateCode()" id="deobfuscateBtn">🔓 Decode Script</button>
                 <button onclick="clearDecode()" id="clearDecodeBtn">🗑️ Clear</button>
             </div>
+            <div class="progress" id="decodeProgress" hidden>
+                <progress max="1" value="0"></progress>
+                <span class="progress-label"></span>
+            </div>
             
             <h2>📜 Hasil Decode:</h2>
             <textarea id="outputDecodeCode" readonly placeholder="Hasil decode akan muncul di sini..."></textarea>
@@ -150,43 +346,180 @@ eval(compile(base64.b64decode(unknownkcc), \"<string>\", \"exec\"))"></textarea>
             document.getElementById(tabName + 'Info').classList.add('active');
         }
         
+        // Encoding and decoding run in the page; the server is only asked for
+        // an optional syntax check. Large inputs are processed in chunks with
+        // a progress bar, yielding to the browser between chunks.
+        const LARGE_INPUT = 256 * 1024;
+        // Multiples of 3 bytes / 4 characters, so chunk results concatenate
+        const ENCODE_CHUNK = 3 * 64 * 1024;
+        const DECODE_CHUNK = 4 * 64 * 1024;
+        const TRIPLE_QUOTE = '"'.repeat(3);
+        
+        async function base64Encode(bytes, progress) {
+            const parts = [];
+            for (let offset = 0; offset < bytes.length; offset += ENCODE_CHUNK) {
+                const chunk = bytes.subarray(offset, offset + ENCODE_CHUNK);
+                let binary = '';
+                for (let i = 0; i < chunk.length; i += 0x8000) {
+                    binary += String.fromCharCode.apply(null, chunk.subarray(i, i + 0x8000));
+                }
+                parts.push(btoa(binary));
+                await showProgress(progress, 'Encoding', offset + chunk.length, bytes.length);
+            }
+            return parts.join('');
+        }
+        
+        async function base64Decode(text, progress) {
+            // Like Python's b64decode: characters outside the alphabet are skipped
+            const clean = text.replace(/[^A-Za-z0-9+/=]/g, '');
+            if (clean.length % 4 !== 0) {
+                throw new Error('Incorrect padding');
+            }
+            const bytes = new Uint8Array(clean.length / 4 * 3);
+            let length = 0;
+            for (let offset = 0; offset < clean.length; offset += DECODE_CHUNK) {
+                const binary = atob(clean.slice(offset, offset + DECODE_CHUNK));
+                for (let i = 0; i < binary.length; i++) {
+                    bytes[length++] = binary.charCodeAt(i);
+                }
+                await showProgress(progress, 'Decoding', offset + DECODE_CHUNK, clean.length);
+            }
+            return new TextDecoder('utf-8', { fatal: true }).decode(bytes.subarray(0, length));
+        }
+        
+        async function obfuscateLocally(code, progress) {
+            const encoded = await base64Encode(new TextEncoder().encode(code), progress);
+            return '#!/usr/bin/env python3\\n' +
+                   'import base64\\n' +
+                   'unknownkcc = ' + TRIPLE_QUOTE + encoded + TRIPLE_QUOTE + '\\n' +
+                   'eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))\\n';
+        }
+        
+        function extractPayload(code) {
+            // Same search order as the server's decode_obfuscated_script
+            const usesBase64 = code.includes('base64.b64decode');
+            let match = code.match(/(\\w+)\\s*=\\s*"{3}([^"]+)"{3}/);
+            if (match && usesBase64) {
+                return match[2].trim();
+            }
+            match = code.match(/(\\w+)\\s*=\\s*'([^']+)'/);
+            if (match && usesBase64) {
+                return match[2].trim();
+            }
+            match = code.match(/base64\\.b64decode\\(["']([^"']+)["']\\)/);
+            if (match) {
+                return match[1].trim();
+            }
+            match = code.match(/"{3}([A-Za-z0-9+/=\\s]+)"{3}/);
+            if (match) {
+                const content = match[1].trim();
+                const compact = content.replace(/\\s+/g, '');
+                if (compact.length % 4 === 0 && /^[A-Za-z0-9+/]*={0,2}$/.test(compact)) {
+                    return content;
+                }
+            }
+            return null;
+        }
+        
+        async function deobfuscateLocally(code, progress) {
+            const payload = extractPayload(code);
+            if (!payload) {
+                throw new Error('Tidak dapat menemukan kode base64 yang valid dalam script');
+            }
+            try {
+                return await base64Decode(payload, progress);
+            } catch (error) {
+                throw new Error('Gagal decode base64: ' + error.message);
+            }
+        }
+        
+        function validateOnServer(code, progress) {
+            return new Promise((resolve, reject) => {
+                const xhr = new XMLHttpRequest();
+                xhr.open('POST', '/validate');
+                xhr.setRequestHeader('Content-Type', 'text/x-python');
+                xhr.setRequestHeader('Accept', 'application/json');
+                xhr.upload.onprogress = event => {
+                    if (event.lengthComputable) {
+                        showProgress(progress, 'Upload untuk validasi', event.loaded, event.total);
+                    }
+                };
+                xhr.upload.onload = () => showProgress(progress, 'Validasi syntax di server', 1, 1);
+                xhr.onload = () => {
+                    try {
+                        resolve(JSON.parse(xhr.responseText));
+                    } catch (error) {
+                        reject(new Error('HTTP ' + xhr.status));
+                    }
+                };
+                xhr.onerror = () => reject(new Error('Validasi gagal'));
+                xhr.send(code);
+            });
+        }
+        
+        function startProgress(progressId, code) {
+            if (code.length < LARGE_INPUT) {
+                return null;
+            }
+            const progress = document.getElementById(progressId);
+            progress.hidden = false;
+            return progress;
+        }
+        
+        function showProgress(progress, label, done, total) {
+            if (!progress) {
+                return Promise.resolve();
+            }
+            done = Math.min(done, total);
+            progress.querySelector('progress').value = total ? done / total : 1;
+            progress.querySelector('.progress-label').textContent =
+                label + ' ' + formatBytes(done) + ' / ' + formatBytes(total);
+            // Let the browser repaint before the next chunk
+            return new Promise(resolve => setTimeout(resolve));
+        }
+        
+        function formatBytes(bytes) {
+            if (bytes < 1024 * 1024) {
+                return (bytes / 1024).toFixed(0) + ' KB';
+            }
+            return (bytes / (1024 * 1024)).toFixed(1) + ' MB';
+        }
+        
         async function obfuscateCode() {
             const inputCode = document.getElementById('inputCode').value.trim();
             const outputCode = document.getElementById('outputCode');
             const obfuscateBtn = document.getElementById('obfuscateBtn');
             const copyBtn = document.getElementById('copyBtn');
             const downloadBtn = document.getElementById('downloadBtn');
-            
+        
             if (!inputCode) {
                 alert('Silakan masukkan kode Python terlebih dahulu!');
                 return;
             }
-            
+        
             obfuscateBtn.disabled = true;
             obfuscateBtn.textContent = '⏳ Encoding...';
-            
+            const progress = startProgress('encodeProgress', inputCode);
+        
             try {
-                const response = await fetch('/obfuscate', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ code: inputCode })
-                });
-                
-                const result = await response.json();
-                
-                if (result.success) {
-                    outputCode.value = result.obfuscated_code;
-                    copyBtn.disabled = false;
-                    downloadBtn.disabled = false;
-                    alert('✅ Kode berhasil di-encode!');
-                } else {
-                    alert('❌ Error: ' + result.error);
+                if (document.getElementById('validateSyntax').checked) {
+                    const result = await validateOnServer(inputCode, progress);
+                    if (!result.success) {
+                        alert('❌ Error: ' + result.error);
+                        return;
+                    }
                 }
+        
+                outputCode.value = await obfuscateLocally(inputCode, progress);
+                copyBtn.disabled = false;
+                downloadBtn.disabled = false;
+                alert('✅ Kode berhasil di-encode!');
             } catch (error) {
                 alert('❌ Terjadi kesalahan: ' + error.message);
             } finally {
+                if (progress) {
+                    progress.hidden = true;
+                }
                 obfuscateBtn.disabled = false;
                 obfuscateBtn.textContent = '🔒 Encode Script';
             }
@@ -198,37 +531,27 @@ eval(compile(base64.b64decode(unknownkcc), \"<string>\", \"exec\"))"></textarea>
             const deobfuscateBtn = document.getElementById('deobfuscateBtn');
             const copyBtn = document.getElementById('copyDecodeBtn');
             const downloadBtn = document.getElementById('downloadDecodeBtn');
-            
+        
             if (!inputCode) {
                 alert('Silakan masukkan kode yang sudah di-encode terlebih dahulu!');
                 return;
             }
-            
+        
             deobfuscateBtn.disabled = true;
             deobfuscateBtn.textContent = '⏳ Decoding...';
-            
+            const progress = startProgress('decodeProgress', inputCode);
+        
             try {
-                const response = await fetch('/deobfuscate', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ code: inputCode })
-                });
-                
-                const result = await response.json();
-                
-                if (result.success) {
-                    outputCode.value = result.deobfuscated_code;
-                    copyBtn.disabled = false;
-                    downloadBtn.disabled = false;
-                    alert('✅ Kode berhasil di-decode!');
-                } else {
-                    alert('❌ Error: ' + result.error);
-                }
+                outputCode.value = await deobfuscateLocally(inputCode, progress);
+                copyBtn.disabled = false;
+                downloadBtn.disabled = false;
+                alert('✅ Kode berhasil di-decode!');
             } catch (error) {
-                alert('❌ Terjadi kesalahan: ' + error.message);
+                alert('❌ Error: ' + error.message);
             } finally {
+                if (progress) {
+                    progress.hidden = true;
+                }
                 deobfuscateBtn.disabled = false;
                 deobfuscateBtn.textContent = '🔓 Decode Script';
             }
@@ -275,10 +598,17 @@ eval(compile(base64.b64decode(unknownkcc), \"<string>\", \"exec\"))"></textarea>
 </html>
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html; charset=utf-8')
-        self.end_headers()
-        self.wfile.write(html_content.encode('utf-8'))
+        self.send_body(html_content.encode('utf-8'), 'text/html; charset=utf-8')
+    
+    def serve_readiness(self):
+        """Ready while accepting traffic; 503 once draining, so load balancers move away"""
+        server = self.server
+        self.send_json_response({
+            'status': 'draining' if server.draining else 'ready',
+            'in_flight': server.in_flight,
+            'routes': {route: limiter.stats() for route, limiter in server.limiters.items()},
+            'jobs': server.jobs.stats(),
+        }, status=503 if server.draining else 200)
     
     def serve_css(self):
         """Serve CSS styles"""
@@ -364,6 +694,37 @@ eval(compile(base64.b64decode(unknownkcc), \"<string>\", \"exec\"))"></textarea>
             flex-wrap: wrap;
         }
         
+        .option {
+            margin-top: 10px;
+            display: flex;
+            align-items: center;
+            gap: 6px;
+            font-size: 14px;
+            color: #555;
+        }
+        
+        .progress {
+            margin-top: 15px;
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }
+        
+        .progress[hidden] {
+            display: none;
+        }
+        
+        .progress progress {
+            flex: 1;
+            height: 16px;
+        }
+        
+        .progress-label {
+            font-size: 14px;
+            color: #555;
+            min-width: 220px;
+        }
+        
         button {
             padding: 12px 24px;
             border: none;
@@ -526,76 +887,251 @@ eval(compile(base64.b64decode(unknownkcc), \"<string>\", \"exec\"))"></textarea>
         }
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/css')
-        self.end_headers()
-        self.wfile.write(css_content.encode('utf-8'))
+        self.send_body(css_content.encode('utf-8'), 'text/css')
     
     def handle_obfuscation(self):
         """Handle the obfuscation request"""
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            python_code = self.read_code()
             
-            python_code = data.get('code', '').strip()
-            
-            if not python_code:
-                self.send_json_response({'success': False, 'error': 'Kode Python tidak boleh kosong'})
+            if not python_code.strip():
+                self.send_failure('Kode Python tidak boleh kosong', 400)
                 return
             
-            # Validate Python syntax
+            # Validate Python syntax and encode the code
             try:
-                compile(python_code, '<string>', 'exec')
+                obfuscated_script = self.server.run_job(obfuscate_job, python_code)
             except SyntaxError as e:
-                self.send_json_response({'success': False, 'error': f'Syntax error: {str(e)}'})
+                self.send_failure(f'Syntax error: {str(e)}', 422)
+                return
+            except (JobTimeout, WorkerCrashed) as e:
+                self.send_job_failure(e)
                 return
             
-            # Encode the Python code
-            encoded_code = self.encode_python_script(python_code)
-            obfuscated_script = self.create_obfuscated_script(encoded_code)
-            
-            self.send_json_response({
-                'success': True,
-                'obfuscated_code': obfuscated_script
-            })
+            self.send_result('obfuscated_code', obfuscated_script)
             
         except Exception as e:
-            self.send_json_response({'success': False, 'error': str(e)})
+            self.send_failure(str(e), 400)
     
     def handle_deobfuscation(self):
         """Handle the deobfuscation request"""
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
-            obfuscated_code = data.get('code', '').strip()
+            obfuscated_code = self.read_code()
             
-            if not obfuscated_code:
-                self.send_json_response({'success': False, 'error': 'Kode yang sudah di-encode tidak boleh kosong'})
+            if not obfuscated_code.strip():
+                self.send_failure('Kode yang sudah di-encode tidak boleh kosong', 400)
                 return
             
             # Try to extract the base64 encoded content
             try:
-                decoded_script = self.decode_obfuscated_script(obfuscated_code)
-                self.send_json_response({
-                    'success': True,
-                    'deobfuscated_code': decoded_script
-                })
+                decoded_script = self.server.run_job(deobfuscate_job, obfuscated_code)
+                self.send_result('deobfuscated_code', decoded_script)
+            except (JobTimeout, WorkerCrashed) as e:
+                self.send_job_failure(e)
             except Exception as e:
-                self.send_json_response({'success': False, 'error': f'Gagal decode: {str(e)}'})
+                self.send_failure(f'Gagal decode: {str(e)}', 422)
                 
         except Exception as e:
-            self.send_json_response({'success': False, 'error': str(e)})
+            self.send_failure(str(e), 400)
+    
+    def handle_validation(self):
+        """Handle a syntax-check-only request; the page encodes and decodes by itself"""
+        try:
+            python_code = self.read_code()
+            
+            if not python_code.strip():
+                self.send_failure('Kode Python tidak boleh kosong', 400)
+                return
+            
+            try:
+                self.server.run_job(validate_job, python_code)
+            except SyntaxError as e:
+                self.send_failure(f'Syntax error: {str(e)}', 422)
+                return
+            except (JobTimeout, WorkerCrashed) as e:
+                self.send_job_failure(e)
+                return
+            
+            self.send_json_response({'success': True, 'valid': True})
+            
+        except Exception as e:
+            self.send_failure(str(e), 400)
     
-    def encode_python_script(self, script_content):
+    def handle_job_submission(self):
+        """Queue a job for one script or a batch of files, answering 202 with its id
+        
+        Takes the same bodies as /obfuscate, plus {"files": {name: code}} for
+        a batch; "action" (JSON field or ?action=) picks deobfuscate instead.
+        """
+        try:
+            action, files, batch = self.read_job_request()
+        except Exception as e:
+            self.send_failure(str(e), 400)
+            return
+        
+        if not files or not all(code.strip() for code in files.values()):
+            self.send_failure('Kode tidak boleh kosong', 400)
+            return
+        
+        work = functools.partial(run_code_job, self.server, action, list(files.items()), batch)
+        try:
+            job = self.server.jobs.submit(work, action=action, batch=batch, stage='queued', progress=0.0,
+                                          done=0, total=len(files),
+                                          read=sum(len(code) for code in files.values()))
+        except Overloaded as e:
+            self.send_json_response({'success': False, 'error': f'Antrean job penuh ({e}), coba lagi nanti'},
+                                    status=503, headers={'Retry-After': str(e.retry_after)})
+            return
+        
+        status_url = f'/jobs/{job.id}'
+        self.send_json_response({'success': True, 'job_id': job.id, 'status': job.info['status'],
+                                 'status_url': status_url, 'result_url': status_url + '/result',
+                                 'events_url': status_url + '/events'},
+                                status=202, headers={'Location': status_url})
+    
+    def read_job_request(self):
+        """Parse a job submission into (action, {name: code}, batch)
+        
+        A single script is stored under the name None, as read_code() reads it.
+        """
+        if self.request_type() != 'application/json':
+            query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+            action, files, batch = query.get('action', ['obfuscate'])[0], {None: self.read_body()}, False
+        else:
+            data = json.loads(self.read_body().decode('utf-8'))
+            action, files, batch = data.get('action', 'obfuscate'), data.get('files'), 'files' in data
+            if not batch:
+                files = {None: data.get('code', '').strip()}
+            elif not (isinstance(files, dict) and all(isinstance(code, str) for code in files.values())):
+                raise ValueError('"files" harus berupa object {nama: kode}')
+        if action not in JOB_ACTIONS:
+            raise ValueError(f'Action tidak dikenal: {action}')
+        return action, files, batch
+    
+    def serve_job(self):
+        """Job status (GET /jobs/{id}), result (/result) or progress stream (/events)"""
+        job_id, _, rest = self.path.split('?')[0][len('/jobs/'):].partition('/')
+        if rest not in ('', 'result', 'events'):
+            self.send_error(404)
+            return
+        
+        info = self.server.jobs.get(job_id)
+        result = self.server.jobs.result(job_id) if rest == 'result' and info and info['status'] == DONE else None
+        if info is None or (rest == 'result' and info['status'] == DONE and result is None):
+            self.send_json_response({'success': False, 'error': 'Job tidak ditemukan atau sudah kedaluwarsa'},
+                                    status=404)
+        elif rest == 'events':
+            self.stream_job_events(job_id)
+        elif not rest:
+            self.send_json_response({'success': True, 'job': job_status(info)})
+        elif info['status'] == FAILED:
+            self.send_failure(info['error'], 422)
+        elif info['status'] != DONE:
+            self.send_json_response({'success': False, 'error': 'Job belum selesai',
+                                     'job': job_status(info)}, status=409)
+        elif info['batch']:
+            self.send_body(result, 'application/json')
+        else:
+            self.send_result(JOB_ACTIONS[info['action']][1], result.decode('utf-8'))
+    
+    def stream_job_events(self, job_id):
+        """Stream a job's progress as Server-Sent Events until it finishes
+        
+        Sends a "progress" event whenever the stored status changes, then a
+        final "done" or "failed" event. A comment line every SSE_HEARTBEAT
+        seconds tells a live but quiet stream from a dead one; the job's
+        "updated" time tells a stalled job from a slow one. The stream ends
+        early when the server drains, and EventSource clients reconnect.
+        """
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.close_connection = True
+        self.end_headers()
+        
+        last, last_sent = None, time.monotonic()
+        try:
+            while not self.server.draining:
+                info = self.server.jobs.get(job_id)
+                if info is None:
+                    info = {'status': FAILED, 'error': 'Job tidak ditemukan atau sudah kedaluwarsa'}
+                status = job_status(info)
+                if status != last:
+                    event = info['status'] if info['status'] in (DONE, FAILED) else 'progress'
+                    self.wfile.write(f'event: {event}\ndata: {json.dumps(status)}\n\n'.encode('utf-8'))
+                    if event != 'progress':
+                        return
+                    last, last_sent = status, time.monotonic()
+                elif time.monotonic() - last_sent >= SSE_HEARTBEAT:
+                    self.wfile.write(b': keepalive\n\n')
+                    last_sent = time.monotonic()
+                time.sleep(SSE_POLL_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+    
+    def request_type(self):
+        """Media type of the request body; JSON unless a raw code type is given"""
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        return content_type if content_type in RAW_TYPES else 'application/json'
+    
+    def response_type(self):
+        """Media type for the response, from Accept; defaults to the request's type"""
+        return negotiate(self.headers.get('Accept'), ('application/json',) + RAW_TYPES,
+                         self.request_type())
+    
+    def read_code(self):
+        """Read the submitted code: the "code" field of a JSON body, or a raw body as bytes
+        
+        Raw bodies are passed on undecoded (UTF-8 decoding happens in the job) and
+        unstripped, so the file round-trips byte for byte.
+        """
+        post_data = self.read_body()
+        if self.request_type() != 'application/json':
+            return post_data
+        data = json.loads(post_data.decode('utf-8'))
+        return data.get('code', '').strip()
+    
+    def send_result(self, key, code):
+        """Send a successful result as JSON ({"success": true, key: code}) or as a raw body"""
+        content_type = self.response_type()
+        if content_type == 'application/json':
+            self.send_json_response({'success': True, key: code})
+            return
+        
+        if content_type.startswith('text/'):
+            content_type += '; charset=utf-8'
+        self.send_body(code.encode('utf-8'), content_type)
+    
+    def send_failure(self, error, status):
+        """Send an error as a small JSON body
+        
+        JSON API clients keep getting 200 with "success": false; raw clients
+        get a real error status (plus the message in X-Dusk-Error) instead.
+        """
+        if self.response_type() == 'application/json':
+            self.send_json_response({'success': False, 'error': error})
+        else:
+            header = error.encode('ascii', 'replace').decode('ascii').replace('\r', ' ').replace('\n', ' ')
+            self.send_json_response({'success': False, 'error': error}, status=status,
+                                    headers={'X-Dusk-Error': header[:200]})
+    
+    def send_job_failure(self, error):
+        """Answer a request whose worker had to be killed"""
+        if isinstance(error, JobTimeout):
+            message = f'Proses melebihi batas waktu {self.server.pool.timeout:g} detik'
+        else:
+            message = 'Worker berhenti saat memproses request'
+        self.send_json_response({'success': False, 'error': message}, status=504)
+    
+    @staticmethod
+    def encode_python_script(script_content):
         """Encode Python script content using base64"""
         script_bytes = script_content.encode('utf-8')
         encoded_bytes = base64.b64encode(script_bytes)
         return encoded_bytes.decode('ascii')
     
-    def create_obfuscated_script(self, encoded_content):
+    @staticmethod
+    def create_obfuscated_script(encoded_content):
         """Create the obfuscated Python script wrapper"""
         return f'''#!/usr/bin/env python3
 import base64
@@ -603,7 +1139,8 @@ unknownkcc = """{encoded_content}"""
 eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
 '''
     
-    def decode_obfuscated_script(self, obfuscated_code):
+    @staticmethod
+    def decode_obfuscated_script(obfuscated_code):
         """Decode an obfuscated Python script back to original"""
         import re
         
@@ -647,7 +1184,7 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
             if match:
                 # Validate if it's actually base64
                 content = match.group(1).strip()
-                if self.is_base64(content):
+                if ObfuscatorWebHandler.is_base64(content):
                     base64_content = content
         
         if not base64_content:
@@ -661,7 +1198,8 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         except Exception as e:
             raise ValueError(f"Gagal decode base64: {str(e)}")
     
-    def is_base64(self, s):
+    @staticmethod
+    def is_base64(s):
         """Check if string is valid base64."""
         try:
             # Remove whitespace and newlines
@@ -675,39 +1213,377 @@ eval(compile(base64.b64decode(unknownkcc), "<string>", "exec"))
         except:
             return False
     
-    def send_json_response(self, data):
+    def send_json_response(self, data, status=200, headers=None):
         """Send JSON response"""
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
+        self.send_body(json.dumps(data).encode('utf-8'), 'application/json', status, headers)
+    
+    def send_body(self, body, content_type, status=200, headers=None):
+        """Send a response body, gzip/deflate compressed if the client accepts it
+        
+        Bodies under COMPRESS_MIN_SIZE go out as they are. Larger ones are
+        compressed chunk by chunk onto the socket, so the compressed copy is
+        never held in full; the response then has no Content-Length and ends
+        when the connection closes.
+        """
+        encoding = None
+        if len(body) >= COMPRESS_MIN_SIZE:
+            encoding = negotiate(self.headers.get('Accept-Encoding'), tuple(CONTENT_ENCODINGS), None)
+        
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Vary', 'Accept-Encoding')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        
+        if encoding is None:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        
+        self.send_header('Content-Encoding', encoding)
+        self.close_connection = True
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, CONTENT_ENCODINGS[encoding])
+        view = memoryview(body)
+        for offset in range(0, len(view), COMPRESS_CHUNK):
+            self.wfile.write(compressor.compress(view[offset:offset + COMPRESS_CHUNK]))
+        self.wfile.write(compressor.flush())
     
     def log_message(self, format, *args):
         """Override to reduce log noise"""
         pass
 
-def run_web_server(port=5000):
-    """Run the web server"""
+class CountingWriter:
+    """Socket writer wrapper counting bytes sent, for the access log"""
+    
+    def __init__(self, raw):
+        self.raw = raw
+        self.count = 0
+    
+    def write(self, data):
+        written = self.raw.write(data)
+        self.count += len(data)
+        return written
+    
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+def negotiate(accept, offers, default):
+    """Pick the offer an Accept-style header (Accept, Accept-Encoding) ranks highest"""
+    best, best_q = default, 0.0
+    for part in (accept or '').split(','):
+        media, *params = part.split(';')
+        media = media.strip().lower()
+        if media not in offers:
+            continue  # Wildcards leave the default in place
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media, q
+    return best
+
+def obfuscate_job(python_code):
+    """Validate and wrap a script: the CPU-heavy part of /obfuscate.
+    
+    Module-level so the worker pool can run it; raises SyntaxError.
+    """
+    if isinstance(python_code, bytes):
+        python_code = python_code.decode('utf-8')
+    validate_job(python_code)
+    return encode_job(python_code)
+
+def validate_job(python_code):
+    """Syntax-check a script (first step of obfuscate_job); raises SyntaxError"""
+    if isinstance(python_code, bytes):
+        python_code = python_code.decode('utf-8')
+    compile(python_code, '<string>', 'exec')
+
+def encode_job(python_code):
+    """Wrap an already validated script (second step of obfuscate_job)"""
+    if isinstance(python_code, bytes):
+        python_code = python_code.decode('utf-8')
+    encoded_code = ObfuscatorWebHandler.encode_python_script(python_code)
+    return ObfuscatorWebHandler.create_obfuscated_script(encoded_code)
+
+def deobfuscate_job(obfuscated_code):
+    """Extract and decode a wrapper payload: the CPU-heavy part of /deobfuscate"""
+    if isinstance(obfuscated_code, bytes):
+        obfuscated_code = obfuscated_code.decode('utf-8')
+    return ObfuscatorWebHandler.decode_obfuscated_script(obfuscated_code)
+
+def describe_job_error(action, error):
+    """User-facing message for a failed obfuscate/deobfuscate step"""
+    if isinstance(error, SyntaxError):
+        return f'Syntax error: {error}'
+    if isinstance(error, JobTimeout):
+        return 'Proses melebihi batas waktu'
+    if isinstance(error, WorkerCrashed):
+        return 'Worker berhenti saat memproses'
+    return f'Gagal decode: {error}' if action == 'deobfuscate' else str(error)
+
+def run_code_job(server, action, files, batch, job):
+    """Body of a background job: run each file through the action's steps
+    
+    Before every step the job records its stage, the bytes each finished
+    step has processed so far (validated, encoded or decoded) and the
+    overall progress. A single script fails the job on error and returns
+    the code itself; a batch returns the JSON result body, with failures
+    listed per file.
+    """
+    steps = JOB_ACTIONS[action][0]
+    total = sum(len(code) for _, code in files) * len(steps) or 1
+    counters = {counter: 0 for _, _, counter in steps}
+    results, errors = {}, {}
+    finished = 0
+    for done, (name, code) in enumerate(files):
+        try:
+            for n, (stage, func, counter) in enumerate(steps):
+                job.update(stage=stage, done=done, current=name,
+                           progress=(finished + n * len(code)) / total, **counters)
+                results[name] = server.run_job(func, code)
+                counters[counter] += len(code)
+        except Exception as e:
+            results.pop(name, None)
+            if not batch:
+                raise ValueError(describe_job_error(action, e)) from e
+            errors[name] = describe_job_error(action, e)
+        finished += len(code) * len(steps)
+    job.update(stage='writing', done=len(files), current=None, progress=1.0, **counters)
+    
+    if not batch:
+        return results[None].encode('utf-8')
+    return json.dumps({'success': True, 'files': results, 'errors': errors}).encode('utf-8')
+
+def job_status(info):
+    """Public view of a job's stored status; "written" is the size of the stored result"""
+    status = {key: value for key, value in info.items() if key not in ('pid', 'size')}
+    status['written'] = info.get('size', 0)
+    return status
+
+# Job action -> (steps as (stage, worker function, progress counter), result key)
+JOB_ACTIONS = {
+    'obfuscate': ((('validating', validate_job, 'validated'), ('encoding', encode_job, 'encoded')),
+                  'obfuscated_code'),
+    'deobfuscate': ((('decoding', deobfuscate_job, 'decoded'),), 'deobfuscated_code'),
+}
+
+class ObfuscatorWebServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the request limits shared by all handlers"""
+    
+    daemon_threads = True
+    
+    def __init__(self, server_address, handler_class, max_body=DEFAULT_MAX_BODY,
+                 concurrency=DEFAULT_CONCURRENCY, max_queue=DEFAULT_MAX_QUEUE,
+                 max_wait=DEFAULT_MAX_WAIT, reuse_port=False, pool_size=0,
+                 job_timeout=DEFAULT_JOB_TIMEOUT, access_log=None, log_sample=1.0,
+                 job_dir=None, job_workers=DEFAULT_JOB_WORKERS, job_queue=DEFAULT_MAX_PENDING,
+                 job_ttl=DEFAULT_RESULT_TTL, job_store=DEFAULT_MAX_BYTES):
+        self.reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+        self.max_body = max_body
+        self.limiters = {route: RouteLimiter(concurrency, max_queue, max_wait)
+                         for route in ('/obfuscate', '/deobfuscate', '/validate', '/jobs')}
+        # Workers start on first use, i.e. after a pre-fork worker has forked
+        self.pool = WorkerPool(pool_size, job_timeout) if pool_size else None
+        self.access_log = AccessLog(access_log, log_sample) if access_log else None
+        self.jobs = JobStore(job_dir, job_workers, job_queue, job_ttl, job_store)
+        self.draining = False
+        self.in_flight = 0
+        self.in_flight_cond = threading.Condition()
+    
+    def process_request(self, request, client_address):
+        # Counted here, before the thread starts, so drain() cannot miss it
+        with self.in_flight_cond:
+            self.in_flight += 1
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self.request_done()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.request_done()
+    
+    def request_done(self):
+        with self.in_flight_cond:
+            self.in_flight -= 1
+            self.in_flight_cond.notify_all()
+    
+    def drain(self, timeout=DEFAULT_DRAIN_TIMEOUT):
+        """Stop accepting and wait for in-flight requests, returns True if all finished
+        
+        Call after serve_forever() has returned. Connections already queued
+        in the listen backlog are still served rather than reset.
+        """
+        self.draining = True
+        self.socket.setblocking(False)
+        while True:
+            try:
+                request, client_address = self.get_request()
+            except OSError:
+                break
+            request.setblocking(True)
+            self.process_request(request, client_address)
+        self.socket.close()
+        
+        deadline = time.monotonic() + timeout
+        with self.in_flight_cond:
+            while self.in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.in_flight_cond.wait(remaining)
+        return True
+    
+    def run_job(self, func, data):
+        """Run a CPU-heavy step in the worker pool, or inline without one"""
+        if self.pool is None:
+            return func(data)
+        return self.pool.run(func, data)
+    
+    def server_close(self):
+        super().server_close()
+        self.jobs.close()
+        if self.pool:
+            self.pool.close()
+        if self.access_log:
+            self.access_log.close()
+    
+    def server_bind(self):
+        """Bind, sharing the port with the other pre-fork workers if requested"""
+        if self.reuse_port:
+            import socket
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+def run_web_server(port=5000, processes=1, drain_timeout=DEFAULT_DRAIN_TIMEOUT, **server_options):
+    """Run the web server; server_options are passed on to ObfuscatorWebServer"""
     server_address = ('0.0.0.0', port)
-    httpd = HTTPServer(server_address, ObfuscatorWebHandler)
     
-    print(f"🌐 Python Script Obfuscator Web Interface")
-    print(f"📡 Server berjalan di: http://localhost:{port}")
-    print(f"🔗 Akses dari browser: http://localhost:{port}")
-    print(f"⏹️  Tekan Ctrl+C untuk stop server")
-    print("=" * 50)
+    def print_banner():
+        print(f"🌐 Python Script Obfuscator Web Interface")
+        print(f"📡 Server berjalan di: http://localhost:{port}")
+        print(f"🔗 Akses dari browser: http://localhost:{port}")
+        if processes > 1:
+            print(f"⚙️  {processes} worker proses (SO_REUSEPORT)")
+        print(f"⏹️  Tekan Ctrl+C untuk stop server")
+        print("=" * 50)
     
+    if processes > 1:
+        import dusk_prefork
+        
+        if not dusk_prefork.supported():
+            print("✗ --processes butuh fork() dan SO_REUSEPORT (Linux/BSD/macOS)", file=sys.stderr)
+            return 1
+        shared_job_dir = None
+        if server_options.get('job_dir') is None:
+            # One job directory for all workers, so any of them can answer a poll
+            import tempfile
+            server_options['job_dir'] = shared_job_dir = tempfile.mkdtemp(prefix='dusk-jobs-')
+        make_server = functools.partial(ObfuscatorWebServer, server_address, ObfuscatorWebHandler,
+                                        reuse_port=True, **server_options)
+        try:
+            print_banner()
+            code = dusk_prefork.run_prefork(make_server, processes, drain_timeout)
+        except OSError as e:
+            print(f"✗ Gagal menjalankan server: {e}", file=sys.stderr)
+            return 1
+        finally:
+            if shared_job_dir:
+                import shutil
+                shutil.rmtree(shared_job_dir, ignore_errors=True)
+        print("\n⏹️  Server dihentikan")
+        return code
+    
+    httpd = ObfuscatorWebServer(server_address, ObfuscatorWebHandler, **server_options)
+    print_banner()
+    
+    stopping = []
+    
+    def request_stop(signum, frame):
+        if stopping:
+            raise KeyboardInterrupt  # Second signal: skip the drain
+        stopping.append(signum)
+        # shutdown() waits for serve_forever() to return, so not from this thread
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
     try:
         httpd.serve_forever()
+        print(f"\n⏹️  Server berhenti menerima koneksi, menunggu {httpd.in_flight} request "
+              f"(maksimal {drain_timeout:g} detik)...")
+        if not httpd.drain(drain_timeout):
+            print(f"✗ {httpd.in_flight} request belum selesai, dihentikan paksa", file=sys.stderr)
+            return 1
+        print("⏹️  Server dihentikan")
+        return 0
     except KeyboardInterrupt:
-        print("\n⏹️  Server dihentikan")
-        httpd.shutdown()
+        print("\n✗ Server dihentikan paksa", file=sys.stderr)
+        return 1
+    finally:
+        httpd.server_close()
 
 if __name__ == '__main__':
     import argparse
     
     parser = argparse.ArgumentParser(description='Python Script Obfuscator Web Interface')
     parser.add_argument('-p', '--port', type=int, default=5000, help='Port untuk web server (default: 5000)')
+    parser.add_argument('--max-body', type=int, default=DEFAULT_MAX_BODY // (1024 * 1024),
+                        help='Ukuran maksimal request body dalam MB, lebih besar dijawab 413 (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Request yang diproses bersamaan per endpoint (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f'Request yang boleh antre per endpoint sebelum dijawab 503 (default: {DEFAULT_MAX_QUEUE})')
+    parser.add_argument('--max-wait', type=float, default=DEFAULT_MAX_WAIT,
+                        help=f'SLO waktu antre dalam detik; lebih lama dijawab 503 + Retry-After (default: {DEFAULT_MAX_WAIT})')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Jumlah worker proses yang berbagi port via SO_REUSEPORT; batas request berlaku per proses (default: 1)')
+    parser.add_argument('--pool', type=int, default=0,
+                        help='Jalankan compile/base64 di N proses pool terpisah per server; 0 = di thread request (default: 0)')
+    parser.add_argument('--job-timeout', type=float, default=DEFAULT_JOB_TIMEOUT,
+                        help=f'Batas waktu per job pool dalam detik; worker yang macet di-kill dan diganti (default: {DEFAULT_JOB_TIMEOUT:g})')
+    parser.add_argument('--drain-timeout', type=float, default=DEFAULT_DRAIN_TIMEOUT,
+                        help=f'Saat SIGTERM/Ctrl+C, waktu maksimal (detik) untuk menyelesaikan request yang berjalan (default: {DEFAULT_DRAIN_TIMEOUT:g})')
+    parser.add_argument('--job-workers', type=int, default=DEFAULT_JOB_WORKERS,
+                        help=f'Thread latar belakang untuk /jobs per proses (default: {DEFAULT_JOB_WORKERS})')
+    parser.add_argument('--job-queue', type=int, default=DEFAULT_MAX_PENDING,
+                        help=f'Job yang boleh menunggu per proses sebelum POST /jobs dijawab 503 (default: {DEFAULT_MAX_PENDING})')
+    parser.add_argument('--job-ttl', type=float, default=DEFAULT_RESULT_TTL,
+                        help=f'Detik hasil job disimpan setelah selesai (default: {DEFAULT_RESULT_TTL:g})')
+    parser.add_argument('--job-store', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Total ukuran hasil job yang disimpan dalam MB; yang tertua dibuang lebih dulu (default: 256)')
+    parser.add_argument('--job-dir', metavar='DIR',
+                        help='Direktori status/hasil job (default: direktori sementara, dihapus saat server berhenti)')
+    parser.add_argument('--access-log', metavar='FILE',
+                        help='Tulis access log JSON (satu baris per request) ke FILE, "-" = stderr')
+    parser.add_argument('--log-sample', type=float, default=1.0,
+                        help='Fraksi request sukses yang di-log, 0-1; error selalu di-log (default: 1.0)')
     
     args = parser.parse_args()
-    run_web_server(args.port)
\ No newline at end of file
+    if args.concurrency < 1 or args.max_body < 1 or args.processes < 1:
+        parser.error('--concurrency, --max-body dan --processes minimal 1')
+    if args.pool < 0:
+        parser.error('--pool tidak boleh negatif')
+    if args.job_workers < 1 or args.job_queue < 1:
+        parser.error('--job-workers dan --job-queue minimal 1')
+    if not 0 <= args.log_sample <= 1:
+        parser.error('--log-sample harus antara 0 dan 1')
+    sys.exit(run_web_server(args.port, args.processes, args.drain_timeout,
+                            max_body=args.max_body * 1024 * 1024,
+                            concurrency=args.concurrency, max_queue=args.max_queue,
+                            max_wait=args.max_wait, pool_size=args.pool,
+                            job_timeout=args.job_timeout, access_log=args.access_log,
+                            log_sample=args.log_sample, job_dir=args.job_dir,
+                            job_workers=args.job_workers, job_queue=args.job_queue,
+                            job_ttl=args.job_ttl, job_store=args.job_store * 1024 * 1024))
\ No newline at end of file